@@ -10,11 +10,26 @@ import asyncio
 import aiohttp
 import json
 import time
-import requests
+import random
+import bisect
+import heapq
+import hashlib
+import itertools
+import codecs
+import base64
+import gzip
+import tempfile
+import math
+import threading
+import traceback
+from array import array
+from collections import OrderedDict, Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 from urllib.parse import quote
 from datetime import datetime, timezone, timedelta
-from thefuzz import fuzz, process
+from aiohttp import web
+from thefuzz import fuzz, utils
 from dotenv import load_dotenv
 from dotenv import dotenv_values
 
@@ -44,14 +59,76 @@ REPO_URL = "https://epgenius.org"
 SC_URL = "https://streamcheck.pro"
 CHECK_INTERVAL = 60
 TIMEOUT = 30
-CACHED_PLAYLISTS = None
-PLAYLIST_CACHE_FILE = "playlists_cache.json"
+MONITOR_TICK = 5
+MONITOR_CONFIRM_FAILURES = 3
+MONITOR_CONFIRM_WINDOW = 5
+MONITOR_RECOVERY_SUCCESSES = 3
+MONITOR_RECHECK_INTERVAL = 10
+MONITOR_HISTORY_FILE = "monitor_history.json"
+MONITOR_HISTORY_SIZE = 12000
+MONITOR_HISTORY_SAVE_INTERVAL = 300
+MONITOR_INCIDENT_LIMIT = 20
+MONITOR_LATENCY_SAMPLES = 5
+MONITOR_LATENCY_FACTOR = 3
+MONITOR_LATENCY_FLOOR_MS = 2000
+MONITOR_LATENCY_CLEAR_RATIO = 0.8
+MONITOR_BASELINE_MIN_SAMPLES = 30
+MONITOR_BASELINE_REFRESH = 600
+MONITOR_TARGETS = {
+    "epgenius": {"name": "EPGenius", "url": REPO_URL, "channel_id": BOTLOGCHANNEL_ID, "mention": MOD_MENTIONS, "interval": CHECK_INTERVAL, "timeout": TIMEOUT},
+    "streamcheck": {"name": "StreamCheck", "url": SC_URL, "channel_id": SC_UPDATES_CHANNEL_ID, "mention": GSR_MENTION, "interval": CHECK_INTERVAL, "timeout": TIMEOUT},
+}
+PLAYLIST_CACHE_FILE = "playlists_cache.json.gz"
+LEGACY_PLAYLIST_CACHE_FILE = "playlists_cache.json"
+PLAYLIST_CACHE_SAVE_DELAY = 5
+PLAYLIST_CACHE_COMPRESSLEVEL = 6
+LOGO_CACHE_FILE = "logos_cache.json"
+COMMAND_SYNC_FILE = "command_sync.json"
 PLAYLISTS_URL = "https://epgenius.org/playlists"
 BOT_API_TOKEN = os.getenv("BOT_API_TOKEN")
 GET_API_URL = os.getenv("GET_API_URL")
 POST_API_URL = os.getenv("POST_API_URL")
 FILEID_PATTERN = re.compile(r"/file/d/([a-zA-Z0-9_-]+)")
 FILEID_REGEX = re.compile(r"(?:/file/d/|id=)([a-zA-Z0-9_-]+)|^([a-zA-Z0-9_-]+)$")
+LOGOS_TREE_URL = "https://api.github.com/repos/K-yzu/Logos/git/trees/main?recursive=1"
+HTTP_POOL_LIMIT = 100
+HTTP_POOL_LIMIT_PER_HOST = 10
+HTTP_KEEPALIVE_TIMEOUT = 60
+HTTP_DNS_CACHE_TTL = 300
+JSON_STREAM_CHUNK_SIZE = 64 * 1024
+OUTBOUND_GLOBAL_LIMIT = 40
+OUTBOUND_INTERACTIVE_RESERVE = 10
+OUTBOUND_ROUTE_LIMIT = 5
+OUTBOUND_ROUTE_WINDOW = 5
+ALERT_BATCH_DELAY = 2
+ALERT_MAX_EMBEDS = 10
+USER_LOOKUP_CACHE_TTL = int(os.getenv("USER_LOOKUP_CACHE_TTL", "30"))
+USER_LOOKUP_CACHE_MAX = 1000
+REFRESH_TICK = 15
+REFRESH_AHEAD_RATIO = 0.8
+REFRESH_JITTER = 30
+REFRESH_BACKOFF_BASE = 30
+REFRESH_BACKOFF_MAX = 900
+TIMESTAMP_CACHE_SIZE = 4096
+EPG_LIST_PAGE_SIZE = 25
+OWNER_MATCH_LIMIT = 5
+OWNER_MATCH_CUTOFF = 80
+OWNER_SEARCH_CACHE_SIZE = 256
+CPU_WORKERS = 4
+CPU_WORK_TIMEOUT = 2.0
+CPU_COMMAND_LIMITS = {"epg_search": 4, "epg_list_search": 2}
+SERVICEINFO_MAX_PROBES = 5
+SERVICEINFO_PROBE_DEADLINE = 10
+SERVICEINFO_MAX_BYTES = 256 * 1024
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+LOOP_LAG_INTERVAL = 0.5
+LOOP_LAG_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+LOOP_STALL_THRESHOLD = float(os.getenv("LOOP_STALL_THRESHOLD", "1.0"))
+LOOP_WATCHDOG_POLL = 0.1
+LOOP_STALL_ALERT_COOLDOWN = 600
+LOOP_STALL_STACK_FRAMES = 12
 
 # ============================================================================
 # COMMAND ERROR MESSAGES
@@ -103,26 +180,932 @@ REGISTER_MESSAGES = {
 
 playlist_cache = {
     "data": None,
-    "timestamp": None,
-    "ttl": 300
+    "timestamp": 0,
+    "ttl": 300,
+    "refresh_task": None
+}
+
+# Disk snapshot state: hash of the items last written, and the pending debounced save
+playlist_cache_file = {
+    "hash": None,
+    "pending": None,
+    "save_task": None
+}
+
+# ============================================================================
+# PLAYLIST MODELS
+# ============================================================================ 
+
+def null_to_none(value):
+    """Normalize the API's empty and "NULL" placeholders to None"""
+    if value is None or value == "" or value == "NULL":
+        return None
+    return value
+
+class PlaylistRecord:
+    """Registered playlist from GET_API_URL, parsed once per API response"""
+    __slots__ = (
+        'id', 'list_id', 'drive_file_id', 'discord_id', 'file_owner', 'valid', 'auto_update',
+        'uploaded_at', 'last_update_owner', 'last_update_provider'
+    )
+    
+    def __init__(self, data):
+        self.id = null_to_none(data.get('id'))
+        self.list_id = null_to_none(data.get('list_id'))
+        self.drive_file_id = null_to_none(data.get('drive_file_id'))
+        self.discord_id = null_to_none(data.get('discord_id'))
+        self.file_owner = null_to_none(data.get('file_owner'))
+        self.valid = data.get('valid')
+        self.auto_update = data.get('auto_update')
+        self.uploaded_at = parse_timestamp(data.get('uploaded_at'), 'uploaded_at')
+        self.last_update_owner = parse_timestamp(data.get('last_update_owner'), 'last_update_owner')
+        self.last_update_provider = parse_timestamp(data.get('last_update_provider'), 'last_update_provider')
+
+class PlaylistEntry:
+    """Catalog playlist from PLAYLISTS_URL, parsed once per catalog refresh"""
+    __slots__ = (
+        'number', 'owner', 'provider', 'epg_url', 'donation_url', 'thank_message', 'pl_owner_last_update'
+    )
+    
+    def __init__(self, item):
+        owner = null_to_none(item.get('reddit_user'))
+        
+        self.number = item.get('id')
+        self.owner = owner if owner != "N/A" else None
+        self.provider = null_to_none(item.get('service_name'))
+        self.epg_url = null_to_none(item.get('github_epg_url'))
+        self.donation_url = null_to_none(item.get('donation_info'))
+        self.thank_message = null_to_none(item.get('thank_message'))
+        self.pl_owner_last_update = parse_timestamp(item.get('timestamp'), 'pl_owner_last_update')
+    
+    def to_dict(self):
+        """Serialize back to the PLAYLISTS_URL item shape"""
+        return {
+            'id': self.number,
+            'reddit_user': self.owner,
+            'service_name': self.provider,
+            'github_epg_url': self.epg_url,
+            'donation_info': self.donation_url,
+            'thank_message': self.thank_message,
+            'timestamp': self.pl_owner_last_update.isoformat() if self.pl_owner_last_update else None
+        }
+
+def parse_playlist_records(data):
+    """Parse a GET_API_URL user lookup into PlaylistRecords"""
+    if not isinstance(data, list):
+        return data
+    return [PlaylistRecord(item) for item in data]
+
+def parse_file_response(data):
+    """Parse the file record in a GET_API_URL/POST_API_URL file response"""
+    if isinstance(data, dict) and isinstance(data.get('file'), dict):
+        data['file'] = PlaylistRecord(data['file'])
+    return data
+
+# ============================================================================
+# PLAYLIST CATALOG
+# ============================================================================ 
+
+catalog_versions = itertools.count(1)
+
+class PlaylistCatalog:
+    """Indexed view of the PLAYLISTS_URL payload, built once per refresh"""
+    def __init__(self, items):
+        self.version = next(catalog_versions)
+        self.playlists = []
+        self.by_id = {}
+        self.by_owner = {}
+        self.by_provider = {}
+        self.owner_search = None
+        self.owner_search_lock = threading.Lock()
+        
+        for item in items:
+            self.add(item)
+    
+    def add(self, item):
+        """Parse one PLAYLISTS_URL item and index it"""
+        self.owner_search = None
+        entry = PlaylistEntry(item)
+        self.playlists.append(entry)
+        self.by_id[entry.number] = entry
+        
+        if entry.owner:
+            self.by_owner.setdefault(entry.owner.casefold(), []).append(entry)
+        if entry.provider:
+            self.by_provider.setdefault(entry.provider.casefold(), []).append(entry)
+    
+    def __len__(self):
+        return len(self.playlists)
+    
+    def __iter__(self):
+        return iter(self.playlists)
+    
+    def get(self, list_id):
+        """Get a playlist entry by list id"""
+        return self.by_id.get(list_id)
+    
+    def find_owner(self, owner):
+        """Get all playlists for an owner (case-insensitive)"""
+        if not owner:
+            return []
+        return self.by_owner.get(owner.casefold(), [])
+    
+    def find_provider(self, provider):
+        """Get all playlists for a provider (case-insensitive)"""
+        if not provider:
+            return []
+        return self.by_provider.get(provider.casefold(), [])
+    
+    def owners(self):
+        """Sorted unique owner names"""
+        return sorted({p.owner for p in self.playlists if p.owner})
+    
+    def search_owners(self, query):
+        """Fuzzy-match owners, building the owner search index on first use"""
+        with self.owner_search_lock:
+            if self.owner_search is None:
+                self.owner_search = OwnerSearch(self.owners())
+        return self.owner_search.search(query)
+    
+    def match_owners(self, query):
+        """Cheap exact/substring owner match used when fuzzy search is unavailable"""
+        needle = query.strip().casefold()
+        if not needle:
+            return []
+        if needle in self.by_owner:
+            return [(self.by_owner[needle][0].owner, None)]
+        return [(owner, None) for owner in self.owners() if needle in owner.casefold()][:OWNER_MATCH_LIMIT]
+    
+    def filter(self, query):
+        """Playlists whose number equals, or owner/provider contains, the query"""
+        needle = query.casefold()
+        return [
+            p for p in self.playlists
+            if str(p.number) == query
+            or (p.owner and needle in p.owner.casefold())
+            or (p.provider and needle in p.provider.casefold())
+        ]
+    
+    def filter_exact(self, query):
+        """Index-only version of filter: exact number, owner or provider"""
+        if query.isdigit() and int(query) in self.by_id:
+            return [self.by_id[int(query)]]
+        return self.find_owner(query) + self.find_provider(query)
+    
+    def to_items(self):
+        """Serialize the catalog back to PLAYLISTS_URL items"""
+        return [p.to_dict() for p in self.playlists]
+
+class OwnerSearch:
+    """Fuzzy owner matching over unique, pre-normalized owner names"""
+    def __init__(self, owners):
+        self.choices = []
+        self.cache = OrderedDict()
+        self.cache_lock = threading.Lock()
+        seen = set()
+        
+        for owner in owners:
+            if owner.casefold() in seen:
+                continue
+            seen.add(owner.casefold())
+            
+            normalized = utils.full_process(owner, force_ascii=True)
+            if normalized:
+                self.choices.append((owner, normalized, set(normalized.split()), Counter(normalized.replace(" ", ""))))
+    
+    def candidates(self, normalized):
+        """Cheap prefilter: keep owners sharing a token or enough characters with the query"""
+        tokens = set(normalized.split())
+        chars = Counter(normalized.replace(" ", ""))
+        query_len = sum(chars.values())
+        
+        for choice in self.choices:
+            owner, choice_normalized, choice_tokens, choice_chars = choice
+            if tokens & choice_tokens:
+                yield choice
+                continue
+            common = sum((chars & choice_chars).values())
+            if common * 2 >= min(query_len, sum(choice_chars.values())):
+                yield choice
+    
+    def search(self, query):
+        """Return up to OWNER_MATCH_LIMIT (owner, score) pairs scoring at least OWNER_MATCH_CUTOFF"""
+        key = query.casefold()
+        with self.cache_lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key]
+        
+        normalized = utils.full_process(query, force_ascii=True)
+        matches = []
+        if normalized:
+            scored = [
+                (owner, fuzz.WRatio(normalized, choice_normalized, full_process=False))
+                for owner, choice_normalized, _, _ in self.candidates(normalized)
+            ]
+            scored.sort(key=lambda match: match[1], reverse=True)
+            matches = [match for match in scored[:OWNER_MATCH_LIMIT] if match[1] >= OWNER_MATCH_CUTOFF]
+        
+        with self.cache_lock:
+            self.cache[key] = matches
+            if len(self.cache) > OWNER_SEARCH_CACHE_SIZE:
+                self.cache.popitem(last=False)
+        return matches
+
+# ============================================================================
+# CPU WORK EXECUTOR
+# ============================================================================
+
+# Threads rather than processes: the owner search index and catalog live in
+# this process, and the GIL is released often enough to keep the loop responsive
+cpu_executor = ThreadPoolExecutor(max_workers=CPU_WORKERS, thread_name_prefix="epgbot-cpu")
+cpu_slots = {kind: asyncio.Semaphore(limit) for kind, limit in CPU_COMMAND_LIMITS.items()}
+
+def cpu_fallback(kind, reason, fallback):
+    cpu_fallbacks.inc((kind, reason))
+    print(f"CPU work '{kind}' {reason}, using fallback")
+    if fallback is None:
+        raise asyncio.TimeoutError(f"CPU work '{kind}' {reason}")
+    return fallback()
+
+async def run_cpu(kind, func, *args, fallback=None, timeout=CPU_WORK_TIMEOUT):
+    """Run CPU-heavy work in the worker pool, using `fallback` if it is saturated or too slow"""
+    slots = cpu_slots[kind]
+    deadline = time.monotonic() + timeout
+    try:
+        await asyncio.wait_for(slots.acquire(), timeout)
+    except asyncio.TimeoutError:
+        return cpu_fallback(kind, "busy", fallback)
+    
+    # The slot is held until the worker finishes, even if the caller stops waiting
+    future = asyncio.get_running_loop().run_in_executor(cpu_executor, func, *args)
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return await asyncio.wait_for(asyncio.shield(future), max(0, deadline - time.monotonic()))
+    except asyncio.TimeoutError:
+        return cpu_fallback(kind, "timeout", fallback)
+
+# ============================================================================
+# METRICS
+# ============================================================================
+
+def format_metric_labels(names, values):
+    if not names:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for value in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+class CounterMetric:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.values = Counter()
+
+    def inc(self, label_values=(), amount=1):
+        self.values[label_values] += amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{format_metric_labels(self.labels, label_values)} {value}")
+        return lines
+
+class HistogramMetric:
+    def __init__(self, name, help_text, labels=(), buckets=METRICS_LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [count per bucket..., count above last bucket, sum]
+        self.series = {}
+
+    def observe(self, label_values, value):
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                labels = format_metric_labels(self.labels + ("le",), label_values + (bound,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_metric_labels(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {series[-1]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+command_duration = HistogramMetric("epgbot_command_duration_seconds", "Slash command duration from interaction creation to completion", ("command", "status"))
+upstream_duration = HistogramMetric("epgbot_upstream_request_duration_seconds", "Outbound HTTP time to response headers", ("endpoint",))
+upstream_errors = CounterMetric("epgbot_upstream_errors_total", "Outbound HTTP failures and error statuses", ("endpoint", "error"))
+cache_requests = CounterMetric("epgbot_cache_requests_total", "Cache lookups by result", ("cache", "result"))
+loop_lag_duration = HistogramMetric("epgbot_event_loop_lag_seconds", "Event loop scheduling delay", buckets=LOOP_LAG_BUCKETS)
+loop_stalls = CounterMetric("epgbot_event_loop_stalls_total", "Event loop stalls over the threshold by blocking call site", ("site",))
+cpu_fallbacks = CounterMetric("epgbot_cpu_work_fallbacks_total", "CPU work answered by the cheap fallback", ("kind", "reason"))
+metrics_state = {"started_at": time.time(), "loop_lag": 0.0, "runner": None}
+
+def upstream_endpoint(url):
+    """Map a request URL onto a low-cardinality endpoint label"""
+    url = str(url)
+    prefixes = [(GET_API_URL, "playlist_api"), (POST_API_URL, "registration_api"), (PLAYLISTS_URL, "catalog"), ("https://api.github.com/", "github")]
+    prefixes.extend((target.url, f"monitor_{key}") for key, target in monitor_targets.items())
+    for prefix, name in prefixes:
+        if prefix and url.startswith(prefix):
+            return name
+    return "provider"
+
+async def on_metrics_request_start(session, trace_config_ctx, params):
+    trace_config_ctx.start = time.perf_counter()
+    trace_config_ctx.endpoint = upstream_endpoint(params.url)
+
+async def on_metrics_request_end(session, trace_config_ctx, params):
+    upstream_duration.observe((trace_config_ctx.endpoint,), time.perf_counter() - trace_config_ctx.start)
+    if params.response.status >= 400:
+        upstream_errors.inc((trace_config_ctx.endpoint, f"http_{params.response.status}"))
+
+async def on_metrics_request_exception(session, trace_config_ctx, params):
+    upstream_errors.inc((trace_config_ctx.endpoint, type(params.exception).__name__))
+
+metrics_trace = aiohttp.TraceConfig()
+metrics_trace.on_request_start.append(on_metrics_request_start)
+metrics_trace.on_request_end.append(on_metrics_request_end)
+metrics_trace.on_request_exception.append(on_metrics_request_exception)
+
+def cache_stats():
+    """Age in seconds and entry count of each cache"""
+    now = time.time()
+    lookup_ages = [now - timestamp for timestamp, _ in user_lookup_cache.values()]
+    return {
+        "catalog": {
+            "age": now - playlist_cache["timestamp"] if playlist_cache["timestamp"] else None,
+            "entries": len(playlist_cache["data"]) if playlist_cache["data"] else 0
+        },
+        "logos": {
+            "age": now - logo_cache["timestamp"] if logo_cache["timestamp"] else None,
+            "entries": len(logo_cache["data"]) if logo_cache["data"] else 0
+        },
+        "user_lookups": {
+            "age": max(lookup_ages) if lookup_ages else None,
+            "entries": len(user_lookup_cache)
+        }
+    }
+
+def gateway_latency():
+    return None if math.isnan(bot.latency) or math.isinf(bot.latency) else bot.latency
+
+def render_metrics():
+    lines = []
+    for metric in (command_duration, upstream_duration, upstream_errors, cache_requests, loop_lag_duration, loop_stalls, cpu_fallbacks):
+        lines.extend(metric.render())
+    
+    caches = cache_stats()
+    lines += ["# HELP epgbot_cache_age_seconds Seconds since the cache was last refreshed", "# TYPE epgbot_cache_age_seconds gauge"]
+    lines += [f'epgbot_cache_age_seconds{{cache="{name}"}} {stats["age"]}' for name, stats in caches.items() if stats["age"] is not None]
+    lines += ["# HELP epgbot_cache_entries Entries held in the cache", "# TYPE epgbot_cache_entries gauge"]
+    lines += [f'epgbot_cache_entries{{cache="{name}"}} {stats["entries"]}' for name, stats in caches.items()]
+    
+    latency = gateway_latency()
+    if latency is not None:
+        lines += ["# HELP epgbot_gateway_latency_seconds Discord gateway heartbeat latency", "# TYPE epgbot_gateway_latency_seconds gauge"]
+        lines.append(f"epgbot_gateway_latency_seconds {latency}")
+    lines += ["# HELP epgbot_event_loop_lag_last_seconds Most recent event loop lag sample", "# TYPE epgbot_event_loop_lag_last_seconds gauge"]
+    lines.append(f"epgbot_event_loop_lag_last_seconds {metrics_state['loop_lag']}")
+    lines += ["# HELP epgbot_outbound_queue_depth Messages waiting in the outbound queue", "# TYPE epgbot_outbound_queue_depth gauge"]
+    lines.append(f"epgbot_outbound_queue_depth {len(outbound.heap)}")
+    lines += ["# HELP epgbot_ready Whether the bot is connected to the gateway", "# TYPE epgbot_ready gauge"]
+    lines.append(f"epgbot_ready {1 if bot.is_ready() else 0}")
+    lines += ["# HELP epgbot_uptime_seconds Seconds since the bot process started", "# TYPE epgbot_uptime_seconds gauge"]
+    lines.append(f"epgbot_uptime_seconds {time.time() - metrics_state['started_at']}")
+    return "\n".join(lines) + "\n"
+
+async def handle_metrics(request):
+    return web.Response(text=render_metrics(), content_type="text/plain", charset="utf-8")
+
+async def handle_health(request):
+    return web.json_response({
+        "ready": bot.is_ready(),
+        "startup_complete": bot.startup_complete,
+        "uptime": time.time() - metrics_state["started_at"],
+        "gateway_latency": gateway_latency(),
+        "loop_lag": metrics_state["loop_lag"],
+        "loop_stalls": {site: count for (site,), count in loop_stalls.values.most_common(5)},
+        "outbound_queue": len(outbound.heap),
+        "caches": cache_stats(),
+        "monitors": {key: target.state for key, target in monitor_targets.items()}
+    })
+
+async def start_metrics_server():
+    """Serve /metrics and /health on a local port inside the bot's event loop"""
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    app.router.add_get("/health", handle_health)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, METRICS_HOST, METRICS_PORT).start()
+    except OSError as e:
+        print(f"Could not start metrics server on {METRICS_HOST}:{METRICS_PORT}: {e}")
+        await runner.cleanup()
+        return
+    metrics_state["runner"] = runner
+    print(f"Metrics server listening on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+
+async def stop_metrics_server():
+    if metrics_state["runner"] is not None:
+        await metrics_state["runner"].cleanup()
+        metrics_state["runner"] = None
+
+# ============================================================================
+# EVENT LOOP WATCHDOG
+# ============================================================================
+
+# The loop task refreshes the heartbeat; a thread snapshots the loop thread's
+# stack when the heartbeat goes quiet, since the blocked loop cannot do it itself
+watchdog_state = {
+    "heartbeat": time.monotonic(),
+    "loop": None,
+    "loop_thread_id": None,
+    "capture": None,
+    "last_alert": {},
+    "lag_task": None,
+    "thread": None,
+    "stop": threading.Event()
 }
 
+def blocking_call_site(frames):
+    """Innermost frame from this file, falling back to the innermost frame overall"""
+    for frame in reversed(frames):
+        if frame.filename == __file__:
+            return f"{frame.name} ({os.path.basename(frame.filename)}:{frame.lineno})"
+    frame = frames[-1]
+    return f"{frame.name} ({os.path.basename(frame.filename)}:{frame.lineno})"
+
+def watch_loop_heartbeat():
+    """Watchdog thread: capture the loop thread's stack once per stall"""
+    captured_for = None
+    while not watchdog_state["stop"].wait(LOOP_WATCHDOG_POLL):
+        heartbeat = watchdog_state["heartbeat"]
+        stalled_for = time.monotonic() - heartbeat - LOOP_LAG_INTERVAL
+        if stalled_for < LOOP_STALL_THRESHOLD or captured_for == heartbeat:
+            continue
+        
+        frame = sys._current_frames().get(watchdog_state["loop_thread_id"])
+        if frame is None:
+            continue
+        frames = traceback.extract_stack(frame)
+        task = asyncio.current_task(watchdog_state["loop"])
+        watchdog_state["capture"] = {
+            "heartbeat": heartbeat,
+            "site": blocking_call_site(frames),
+            "task": task.get_name() if task else None,
+            "stack": "".join(traceback.format_list(frames[-LOOP_STALL_STACK_FRAMES:]))
+        }
+        captured_for = heartbeat
+
+async def measure_loop_lag():
+    """Sample how late the event loop wakes a sleeping task and report stalls"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        heartbeat = watchdog_state["heartbeat"] = time.monotonic()
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        lag = max(0.0, loop.time() - start - LOOP_LAG_INTERVAL)
+        metrics_state["loop_lag"] = lag
+        loop_lag_duration.observe((), lag)
+        
+        capture = watchdog_state["capture"]
+        if capture is not None:
+            watchdog_state["capture"] = None
+            if capture["heartbeat"] == heartbeat:
+                report_loop_stall(capture, lag)
+
+def report_loop_stall(capture, lag):
+    site = capture["site"]
+    loop_stalls.inc((site,))
+    count = loop_stalls.values[(site,)]
+    print(f"Event loop stalled for {lag:.2f}s at {site} (task {capture['task']}, {count} total)\n{capture['stack']}")
+    
+    now = time.monotonic()
+    if BOTLOGCHANNEL is None or now - watchdog_state["last_alert"].get(site, -LOOP_STALL_ALERT_COOLDOWN) < LOOP_STALL_ALERT_COOLDOWN:
+        return
+    watchdog_state["last_alert"][site] = now
+    
+    stack = capture["stack"][-(4000 - 8):]
+    embed = discord.Embed(
+        title="⏱️ Event Loop Stalled",
+        description=f"```\n{stack}```",
+        color=discord.Color.orange()
+    )
+    embed.add_field(name="Duration", value=f"{lag:.2f}s", inline=True)
+    embed.add_field(name="Occurrences", value=str(count), inline=True)
+    embed.add_field(name="Task", value=capture["task"] or "N/A", inline=True)
+    embed.add_field(name="Call Site", value=site[:1024], inline=False)
+    outbound.queue_alert(BOTLOGCHANNEL, None, embed)
+
+def start_loop_watchdog():
+    if watchdog_state["lag_task"] is not None and not watchdog_state["lag_task"].done():
+        return
+    watchdog_state["loop"] = asyncio.get_running_loop()
+    watchdog_state["loop_thread_id"] = threading.get_ident()
+    watchdog_state["heartbeat"] = time.monotonic()
+    watchdog_state["stop"].clear()
+    watchdog_state["lag_task"] = asyncio.create_task(measure_loop_lag())
+    watchdog_state["thread"] = threading.Thread(target=watch_loop_heartbeat, name="loop-watchdog", daemon=True)
+    watchdog_state["thread"].start()
+    print(f"Event loop watchdog started (threshold {LOOP_STALL_THRESHOLD}s)")
+
+def stop_loop_watchdog():
+    watchdog_state["stop"].set()
+    if watchdog_state["lag_task"] is not None:
+        watchdog_state["lag_task"].cancel()
+        watchdog_state["lag_task"] = None
+
+# ============================================================================
+# SHARED HTTP CLIENT
+# ============================================================================ 
+
+# Timeout profiles per endpoint family, passed per request on the shared session
+HTTP_TIMEOUTS = {
+    "api": aiohttp.ClientTimeout(total=10, connect=5),
+    "catalog": aiohttp.ClientTimeout(total=10, connect=5),
+    "github": aiohttp.ClientTimeout(total=30, connect=10),
+}
+
+http_session = None
+
+def probe_timing_mark(name):
+    """Trace callback that records when a request phase happened"""
+    async def mark(session, trace_config_ctx, params):
+        timings = trace_config_ctx.trace_request_ctx
+        if isinstance(timings, dict):
+            timings[name] = time.perf_counter()
+    return mark
+
+# Only requests passing a dict as trace_request_ctx are timed (monitor probes)
+probe_trace = aiohttp.TraceConfig()
+probe_trace.on_request_start.append(probe_timing_mark("request_start"))
+probe_trace.on_dns_resolvehost_start.append(probe_timing_mark("dns_start"))
+probe_trace.on_dns_resolvehost_end.append(probe_timing_mark("dns_end"))
+probe_trace.on_connection_create_start.append(probe_timing_mark("connect_start"))
+probe_trace.on_connection_create_end.append(probe_timing_mark("connect_end"))
+probe_trace.on_request_end.append(probe_timing_mark("response_start"))
+
+async def start_http_client():
+    """Create the long-lived pooled HTTP session"""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        return http_session
+    
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        use_dns_cache=True
+    )
+    http_session = aiohttp.ClientSession(connector=connector, trace_configs=[probe_trace, metrics_trace])
+    print(f"HTTP client started (limit {HTTP_POOL_LIMIT}, {HTTP_POOL_LIMIT_PER_HOST} per host)")
+    return http_session
+
+async def get_http_session():
+    """Return the shared HTTP session, starting it if needed"""
+    if http_session is None or http_session.closed:
+        return await start_http_client()
+    return http_session
+
+JSON_SEPARATORS = re.compile(r'[\s,]*')
+
+class JsonArrayStream:
+    """Decode the items of a JSON array one at a time as the response body arrives"""
+    def __init__(self, response, key=None):
+        self.content = response.content
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder('utf-8')()
+        if key is None:
+            self.start_pattern = re.compile(r'\[')
+        else:
+            self.start_pattern = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self.buffer = ""
+        self.pos = 0
+        self.prefix = None
+    
+    async def read_more(self):
+        """Append the next chunk to the buffer, dropping text already consumed"""
+        data = await self.content.read(JSON_STREAM_CHUNK_SIZE)
+        if not data:
+            return False
+        self.buffer = self.buffer[self.pos:] + self.text_decoder.decode(data)
+        self.pos = 0
+        return True
+    
+    async def open(self):
+        """Read up to the start of the array and return the JSON text before it"""
+        while self.prefix is None:
+            match = self.start_pattern.search(self.buffer)
+            if match:
+                self.prefix = self.buffer[:match.start()]
+                self.pos = match.end()
+            elif not await self.read_more():
+                raise ValueError("JSON array not found in response")
+        return self.prefix
+    
+    async def items(self):
+        """Yield each decoded array item"""
+        await self.open()
+        while True:
+            self.pos = JSON_SEPARATORS.match(self.buffer, self.pos).end()
+            if self.pos >= len(self.buffer):
+                if not await self.read_more():
+                    raise ValueError("Unexpected end of JSON array")
+                continue
+            if self.buffer[self.pos] == ']':
+                return
+            
+            try:
+                item, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not await self.read_more():
+                    raise
+                continue
+            
+            # A number cut at the chunk edge decodes short, so require a delimiter after each value
+            if (end == len(self.buffer) or self.buffer[end] not in ',] \t\r\n') and await self.read_more():
+                continue
+            
+            self.pos = end
+            yield item
+
+async def close_http_client():
+    """Close the shared HTTP session and its connection pool"""
+    global http_session
+    if http_session is not None and not http_session.closed:
+        await http_session.close()
+        print("HTTP client closed")
+    http_session = None
+
+# ============================================================================
+# OUTBOUND MESSAGE QUEUE
+# ============================================================================
+
+# Lower value is sent first when the global budget is tight
+PRIORITY_INTERACTIVE = 0
+PRIORITY_ALERT = 1
+
+class RouteBucket:
+    """Token bucket mirroring a Discord rate limit bucket"""
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.rate = limit / window
+        self.tokens = limit
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.limit, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, now, reserve=0):
+        """Seconds until a request can be sent, keeping `reserve` tokens back"""
+        self.refill(now)
+        if self.tokens >= 1 + reserve:
+            return 0
+        return (1 + reserve - self.tokens) / self.rate
+
+    def take(self):
+        self.tokens -= 1
+
+class OutboundJob:
+    __slots__ = ("route", "send", "future", "not_before", "channel", "content", "embeds")
+
+    def __init__(self, route, send, future=None, not_before=0):
+        self.route = route
+        self.send = send
+        self.future = future
+        self.not_before = not_before
+        self.channel = None
+        self.content = None
+        self.embeds = None
+
+class OutboundQueue:
+    def __init__(self):
+        self.heap = []
+        self.seq = itertools.count()
+        self.buckets = {}
+        self.global_bucket = RouteBucket(OUTBOUND_GLOBAL_LIMIT, 1)
+        self.pending_alerts = {}
+        self.in_flight = set()
+        self.wakeup = None
+        self.worker = None
+
+    def start(self):
+        if self.worker is None or self.worker.done():
+            self.wakeup = asyncio.Event()
+            self.worker = asyncio.create_task(self.run())
+            print("Outbound message queue started")
+
+    async def stop(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+            self.worker = None
+        if self.heap:
+            print(f"Outbound message queue stopped with {len(self.heap)} messages pending")
+
+    def bucket(self, route):
+        """Route bucket for a channel, or None for routes discord.py already paces"""
+        if route is None:
+            return None
+        bucket = self.buckets.get(route)
+        if bucket is None:
+            bucket = self.buckets[route] = RouteBucket(OUTBOUND_ROUTE_LIMIT, OUTBOUND_ROUTE_WINDOW)
+        return bucket
+
+    def push(self, priority, job):
+        heapq.heappush(self.heap, (priority, next(self.seq), job))
+        if self.wakeup is not None:
+            self.wakeup.set()
+
+    async def submit(self, route, send, priority=PRIORITY_INTERACTIVE):
+        """Queue a Discord call and wait for its result"""
+        future = asyncio.get_running_loop().create_future()
+        self.push(priority, OutboundJob(route, send, future))
+        return await future
+
+    def queue_alert(self, channel, content, embed):
+        """Queue an alert, merging it into a pending alert for the same channel"""
+        job = self.pending_alerts.get(channel.id)
+        if job is not None and len(job.embeds) < ALERT_MAX_EMBEDS and job.content == content:
+            job.embeds.append(embed)
+            return
+        
+        job = OutboundJob(("channel", channel.id), None, not_before=time.monotonic() + ALERT_BATCH_DELAY)
+        job.channel = channel
+        job.content = content
+        job.embeds = [embed]
+        job.send = lambda: job.channel.send(content=job.content, embeds=job.embeds)
+        self.pending_alerts[channel.id] = job
+        self.push(PRIORITY_ALERT, job)
+
+    def dispatch_ready(self):
+        """Start every job whose buckets allow it and return seconds until the next one"""
+        now = time.monotonic()
+        next_delay = None
+        waiting = []
+        
+        while self.heap:
+            priority, seq, job = heapq.heappop(self.heap)
+            reserve = 0 if priority == PRIORITY_INTERACTIVE else OUTBOUND_INTERACTIVE_RESERVE
+            bucket = self.bucket(job.route)
+            delay = max(
+                job.not_before - now,
+                bucket.delay(now) if bucket is not None else 0,
+                self.global_bucket.delay(now, reserve)
+            )
+            if delay > 0:
+                waiting.append((priority, seq, job))
+                next_delay = delay if next_delay is None else min(next_delay, delay)
+                continue
+            
+            if bucket is not None:
+                bucket.take()
+            self.global_bucket.take()
+            if job.channel is not None and self.pending_alerts.get(job.channel.id) is job:
+                del self.pending_alerts[job.channel.id]
+            task = asyncio.create_task(self.deliver(job))
+            self.in_flight.add(task)
+            task.add_done_callback(self.in_flight.discard)
+        
+        for item in waiting:
+            heapq.heappush(self.heap, item)
+        return next_delay
+
+    async def deliver(self, job):
+        # A 429 that slips past the buckets is waited out inside discord.py
+        # (HTTPClient and the webhook adapter both sleep and retry), so any
+        # exception here is a real failure
+        try:
+            result = await job.send()
+        except Exception as e:
+            self.fail(job, e)
+            return
+        
+        if job.future is not None and not job.future.done():
+            job.future.set_result(result)
+
+    def fail(self, job, error):
+        if job.future is not None:
+            if not job.future.done():
+                job.future.set_exception(error)
+        else:
+            print(f"Failed to send queued message: {type(error).__name__} - {error}")
+
+    async def run(self):
+        while True:
+            self.wakeup.clear()
+            delay = self.dispatch_ready()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+outbound = OutboundQueue()
+
+async def send_followup(interaction: discord.Interaction, *args, **kwargs):
+    """Send an interaction followup through the outbound queue"""
+    # Each followup goes to its own interaction webhook, which discord.py's
+    # webhook adapter already paces per token; only the global budget applies
+    return await outbound.submit(None, lambda: interaction.followup.send(*args, **kwargs))
+
 # ============================================================================
 # DISCORD BOT INTENTS
 # ============================================================================ 
 
+class EPGeniusBot(commands.Bot):
+    async def setup_hook(self):
+        await start_http_client()
+        outbound.start()
+        load_command_signatures()
+        load_monitor_history()
+        await start_metrics_server()
+        start_loop_watchdog()
+        load_logo_cache()
+        refresh_scheduler.start()
+
+    async def close(self):
+        await super().close()
+        await outbound.stop()
+        await flush_playlist_cache()
+        await stop_metrics_server()
+        stop_loop_watchdog()
+        cpu_executor.shutdown(wait=False, cancel_futures=True)
+        save_monitor_history(monitor_history_snapshot())
+        await close_http_client()
+
 intents = discord.Intents.default()
 intents.guilds = True
 intents.message_content = True
 intents.members = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+bot = EPGeniusBot(command_prefix="!", intents=intents)
 
 
 # ============================================================================
 # EPGENIUS PLAYLIST INFO API CALLS
 # ============================================================================ 
 
+user_lookup_cache = OrderedDict()
+user_lookup_generations = {}
+lookups_in_flight = {}
+
+async def single_flight(key, fetch):
+    """Share one upstream request between concurrent identical lookups"""
+    task = lookups_in_flight.get(key)
+    if task is None:
+        task = asyncio.create_task(fetch())
+        lookups_in_flight[key] = task
+        task.add_done_callback(lambda done: lookups_in_flight.pop(key) if lookups_in_flight.get(key) is done else None)
+    return await asyncio.shield(task)
+
+def invalidate_user_lookup(duid):
+    """Drop the cached playlist lookup for a user, including one still in flight"""
+    # Bumping the generation stops an older in-flight lookup from caching its result
+    user_lookup_generations[duid] = user_lookup_generations.get(duid, 0) + 1
+    user_lookup_cache.pop(duid, None)
+    lookups_in_flight.pop(("duid", duid), None)
+
 async def get_all_user_playlists(duid):
+    """Get all playlists for a user by DUID, using the short-lived lookup cache"""
+    now = time.time()
+    cached = user_lookup_cache.get(duid)
+    if cached and now - cached[0] < USER_LOOKUP_CACHE_TTL:
+        cache_requests.inc(("user_lookups", "hit"))
+        user_lookup_cache.move_to_end(duid)
+        return cached[1]
+    
+    cache_requests.inc(("user_lookups", "miss"))
+    generation = user_lookup_generations.get(duid, 0)
+    result = await single_flight(("duid", duid), lambda: fetch_all_user_playlists(duid))
+    
+    if result is not None and user_lookup_generations.get(duid, 0) == generation:
+        if len(user_lookup_cache) >= USER_LOOKUP_CACHE_MAX:
+            for key, (timestamp, _) in list(user_lookup_cache.items()):
+                if now - timestamp >= USER_LOOKUP_CACHE_TTL:
+                    del user_lookup_cache[key]
+        user_lookup_cache[duid] = (now, result)
+        user_lookup_cache.move_to_end(duid)
+        # Everything still fresh: drop the least recently used entry
+        while len(user_lookup_cache) > USER_LOOKUP_CACHE_MAX:
+            user_lookup_cache.popitem(last=False)
+    
+    return result
+
+async def fetch_all_user_playlists(duid):
     """Fetch all playlists for a user by DUID"""
     headers = {
         "Authorization": BOT_API_TOKEN,
@@ -133,38 +1116,39 @@ async def get_all_user_playlists(duid):
         "duid": duid
     }
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(
-                GET_API_URL, 
-                headers=headers, 
-                json=json_data,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                if response.status == 404:
-                    return []  # Empty list for 404
-                elif response.status == 200:
-                    return await response.json()
-                else:
-                    text = await response.text()
-                    print(f"Error: {response.status} - {text}")
-                    return None
-        except asyncio.TimeoutError:
-            print(f"Request timed out for user {duid}")
-            return None
-        except Exception as e:
-            print(f"Request failed: {e}")
-            return None
+    session = await get_http_session()
+    try:
+        async with session.get(
+            GET_API_URL, 
+            headers=headers, 
+            json=json_data,
+            timeout=HTTP_TIMEOUTS["api"]
+        ) as response:
+            if response.status == 404:
+                return []  # Empty list for 404
+            elif response.status == 200:
+                return parse_playlist_records(await response.json())
+            else:
+                text = await response.text()
+                print(f"Error: {response.status} - {text}")
+                return None
+    except asyncio.TimeoutError:
+        print(f"Request timed out for user {duid}")
+        return None
+    except Exception as e:
+        print(f"Request failed: {e}")
+        return None
 
 class PlaylistPaginationView(View):
-    def __init__(self, records, playlists_data, is_mod=False):
+    def __init__(self, records, catalog, is_mod=False):
         super().__init__(timeout=180)
         self.records = records
-        self.playlists_data = playlists_data
+        self.catalog = catalog
         self.is_mod = is_mod
         self.current_page = 0
         self.max_page = len(records) - 1
         self.message = None
+        self.embed_cache = {}
 
     async def on_timeout(self):
         """Called when the view times out"""
@@ -174,19 +1158,40 @@ class PlaylistPaginationView(View):
             except:
                 pass  
     
-    def get_embed(self):
-        """Generate embed for current page"""
-        record = self.records[self.current_page]
-        list_id = record.get('list_id')
-        playlist_details = get_playlist_details(list_id, self.playlists_data)
+    def get_embed(self, page=None):
+        """Generate embed for a page, reusing it until the catalog refreshes"""
+        if page is None:
+            page = self.current_page
+        record = self.records[page]
+        
+        # Prefer the live catalog so a background refresh shows up on the next page flip
+        catalog = playlist_cache["data"] or self.catalog
+        key = (record.id, self.is_mod, catalog.version if catalog else None)
+        
+        embed = self.embed_cache.get(key)
+        if embed is not None:
+            return embed
+        
+        if catalog and catalog is not self.catalog:
+            self.catalog = catalog
+            self.embed_cache.clear()
+        
+        playlist_details = get_playlist_details(record.list_id, catalog)
         
         embed = create_file_info_embed(record, playlist_details, is_mod=self.is_mod)
         
         if self.max_page > 0:
-            embed.set_footer(text=f"Playlist {self.current_page + 1} of {self.max_page + 1}")
+            embed.set_footer(text=f"Playlist {page + 1} of {self.max_page + 1}")
         
+        self.embed_cache[key] = embed
         return embed
     
+    def prerender_neighbours(self):
+        """Render the pages either side of the current one ahead of time"""
+        for page in (self.current_page - 1, self.current_page + 1):
+            if 0 <= page <= self.max_page:
+                self.get_embed(page)
+    
     def update_buttons(self):
         """Update button states based on current page"""
         for item in self.children:
@@ -203,6 +1208,7 @@ class PlaylistPaginationView(View):
             self.update_buttons()
             embed = self.get_embed()
             await interaction.response.edit_message(embed=embed, view=self)
+            self.prerender_neighbours()
     
     @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.primary)
     async def next_button(self, interaction: discord.Interaction, button: Button):
@@ -211,77 +1217,96 @@ class PlaylistPaginationView(View):
             self.update_buttons()
             embed = self.get_embed()
             await interaction.response.edit_message(embed=embed, view=self)
+            self.prerender_neighbours()
 
 
-async def fetch_playlists_data():
-    """Fetch and cache playlist data from EPGenius API"""
-    now = datetime.now(timezone.utc)
-    
-    if (playlist_cache["data"] is not None and 
-        playlist_cache["timestamp"] is not None and 
-        (now - playlist_cache["timestamp"]).total_seconds() < playlist_cache["ttl"]):
-        return playlist_cache["data"]
-    
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(PLAYLISTS_URL) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    playlist_cache["data"] = data
-                    playlist_cache["timestamp"] = now
-                    return data
-                else:
-                    print(f"Failed to fetch playlists: {response.status}")
-                    return None
-        except Exception as e:
-            print(f"Error fetching playlists: {e}")
-            return None
 
-def get_playlist_details(list_id, playlists_data):
+def get_playlist_details(list_id, catalog):
     """Get additional playlist details from EPGenius playlists API"""
-    if not playlists_data:
+    if not catalog:
         return None
     
-    for playlist in playlists_data:
-        if playlist.get('id') == list_id:
-            return {
-                'provider': playlist.get('service_name'),
-                'pl_owner': playlist.get('reddit_user'),
-                'epg_url': playlist.get('github_epg_url'),
-                'donation_url': playlist.get('donation_info'),
-                'pl_owner_last_update': playlist.get('timestamp'),
-                'thank_message': playlist.get('thank_message')
-            }
-    return None
+    return catalog.get(list_id)
 
 def build_export_url(drive_file_id):
     """Build Google Drive export URL from file ID"""
     return f"https://drive.google.com/uc?export=download&id={drive_file_id}"
 
-def parse_timestamp(timestamp_str):
+TIMESTAMP_FORMATS = [
+    '%a, %d %b %Y %H:%M:%S %Z',  
+    '%d/%m/%Y',                   
+    '%Y-%m-%dT%H:%M:%S.%fZ',    
+    '%Y-%m-%dT%H:%M:%SZ',      
+    '%Y-%m-%d %H:%M:%S',        
+]
+
+timestamp_cache = OrderedDict()
+timestamp_formats_by_field = {}
+
+def detect_timestamp_format(timestamp_str):
+    """Guess the strptime format from the shape of the string"""
+    if timestamp_str[:3].isalpha() and ',' in timestamp_str:
+        return '%a, %d %b %Y %H:%M:%S %Z'
+    if '/' in timestamp_str:
+        return '%d/%m/%Y'
+    if 'T' in timestamp_str:
+        return '%Y-%m-%dT%H:%M:%S.%fZ' if '.' in timestamp_str else '%Y-%m-%dT%H:%M:%SZ'
+    if ' ' in timestamp_str:
+        return '%Y-%m-%d %H:%M:%S'
+    return None
+
+def parse_iso_timestamp(timestamp_str):
+    """Fast path for ISO-8601 timestamps"""
+    if len(timestamp_str) < 10 or timestamp_str[4] != '-' or not timestamp_str[:4].isdigit():
+        return None
+    try:
+        if timestamp_str.endswith('Z'):
+            timestamp_str = timestamp_str[:-1] + '+00:00'
+        return datetime.fromisoformat(timestamp_str)
+    except ValueError:
+        return None
+
+def parse_timestamp_uncached(timestamp_str, field=None):
+    """Parse a timestamp, trying the field's last good format and the detected format first"""
+    dt = parse_iso_timestamp(timestamp_str)
+    
+    if dt is None:
+        candidates = [timestamp_formats_by_field.get(field), detect_timestamp_format(timestamp_str)]
+        candidates += [fmt for fmt in TIMESTAMP_FORMATS if fmt not in candidates]
+        
+        for fmt in candidates:
+            if fmt is None:
+                continue
+            try:
+                dt = datetime.strptime(timestamp_str, fmt)
+                if field is not None:
+                    timestamp_formats_by_field[field] = fmt
+                break
+            except ValueError:
+                continue
+    
+    if dt is None:
+        print(f"Error parsing timestamp '{timestamp_str}': no matching format found")
+        return None
+    
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+def parse_timestamp(timestamp_str, field=None):
     """Convert timestamp string to datetime object"""
     if not timestamp_str or timestamp_str == "NULL":
         return None
     
-    formats = [
-        '%a, %d %b %Y %H:%M:%S %Z',  
-        '%d/%m/%Y',                   
-        '%Y-%m-%dT%H:%M:%S.%fZ',    
-        '%Y-%m-%dT%H:%M:%SZ',      
-        '%Y-%m-%d %H:%M:%S',        
-    ]
-    
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(timestamp_str, fmt)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except ValueError:
-            continue
+    if timestamp_str in timestamp_cache:
+        timestamp_cache.move_to_end(timestamp_str)
+        return timestamp_cache[timestamp_str]
     
-    print(f"Error parsing timestamp '{timestamp_str}': no matching format found")
-    return None
+    dt = parse_timestamp_uncached(timestamp_str, field)
+    timestamp_cache[timestamp_str] = dt
+    if len(timestamp_cache) > TIMESTAMP_CACHE_SIZE:
+        timestamp_cache.popitem(last=False)
+    return dt
 
 def format_datetime(dt):
     """Format datetime to human-readable string"""
@@ -289,9 +1314,9 @@ def format_datetime(dt):
         return None
     return dt.strftime("%b %d, %Y at %I:%M %p %Z")
 
-def check_timestamp_age(timestamp_str, hours_threshold):
+def check_timestamp_age(timestamp, hours_threshold):
     """Check if timestamp is older than threshold in hours"""
-    dt = parse_timestamp(timestamp_str)
+    dt = parse_timestamp(timestamp) if isinstance(timestamp, str) else timestamp
     if not dt:
         return None
     
@@ -309,6 +1334,10 @@ async def get_file_info_async(file_identifier, duid):
     if not file_id:
         return None
     
+    return await single_flight(("file", file_id, duid), lambda: fetch_file_info(file_id, duid))
+
+async def fetch_file_info(file_id, duid):
+    """Fetch file info for a file ID"""
     headers = {
         "Authorization": BOT_API_TOKEN,
         "Content-Type": "application/json"
@@ -319,18 +1348,23 @@ async def get_file_info_async(file_identifier, duid):
         "duid": duid
     }
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.get(GET_API_URL, headers=headers, json=json_data) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    text = await response.text()
-                    print(f"Error: {response.status} - {text}")
-                    return None
-        except Exception as e:
-            print(f"Request failed: {e}")
-            return None
+    session = await get_http_session()
+    try:
+        async with session.get(
+            GET_API_URL,
+            headers=headers,
+            json=json_data,
+            timeout=HTTP_TIMEOUTS["api"]
+        ) as response:
+            if response.status == 200:
+                return parse_file_response(await response.json())
+            else:
+                text = await response.text()
+                print(f"Error: {response.status} - {text}")
+                return None
+    except Exception as e:
+        print(f"Request failed: {e}")
+        return None
 
 def create_file_info_embed(record, playlist_details, is_mod=False):
     """Create Discord embed for file info display"""
@@ -341,47 +1375,47 @@ def create_file_info_embed(record, playlist_details, is_mod=False):
     
     info_messages = []
     
-    playlist_creation_date = parse_timestamp(record.get('uploaded_at'))
-    last_update_owner = parse_timestamp(record.get('last_update_owner'))
-    pl_owner_last_update_str = playlist_details.get('pl_owner_last_update') if playlist_details else None
-    pl_owner_last_update = parse_timestamp(pl_owner_last_update_str) if pl_owner_last_update_str else None
-    valid = record.get('valid')
-    auto_update = record.get('auto_update')
+    playlist_creation_date = record.uploaded_at
+    last_update_owner = record.last_update_owner
+    pl_owner_last_update = playlist_details.pl_owner_last_update if playlist_details else None
+    provider_dt = record.last_update_provider
+    valid = record.valid
+    auto_update = record.auto_update
     now = datetime.now(timezone.utc)
     
     # Row 1: Playlist Owner, Playlist Number, Service Provider
     if playlist_details:
         embed.add_field(
             name="Playlist Owner",
-            value=playlist_details['pl_owner'] or "N/A",
+            value=playlist_details.owner or "N/A",
             inline=True
         )
     
     embed.add_field(
         name="Playlist Number",
-        value=f"`{record.get('list_id')}`",
+        value=f"`{record.list_id}`",
         inline=True
     )
     
     if playlist_details:
         embed.add_field(
             name="Service Provider",
-            value=playlist_details['provider'] or "N/A",
+            value=playlist_details.provider or "N/A",
             inline=True
         )
     
     # Row 2: Playlist Link, EPG Link + spacer
-    export_url = build_export_url(record.get('drive_file_id'))
+    export_url = build_export_url(record.drive_file_id)
     embed.add_field(
         name="Playlist Link",
         value=f"[Download]({export_url})",
         inline=True
     )
     
-    if playlist_details and playlist_details.get('epg_url'):
+    if playlist_details and playlist_details.epg_url:
         embed.add_field(
             name="EPG Link",
-            value=f"[Download]({playlist_details['epg_url']})",
+            value=f"[Download]({playlist_details.epg_url})",
             inline=True
         )
     
@@ -417,7 +1451,7 @@ def create_file_info_embed(record, playlist_details, is_mod=False):
                     if not last_update_owner:
                         missing_fields.append("Last Free Update")
                     if not pl_owner_last_update:
-                        pl_owner = playlist_details.get('pl_owner', 'Owner') if playlist_details else 'Owner'
+                        pl_owner = (playlist_details.owner if playlist_details else None) or 'Owner'
                         missing_fields.append(f'Last "{pl_owner}" Update')
                     
                     # info_messages.append(MESSAGES["FREE_MISS_MSG"].format(missing_sync=" and ".join(missing_fields)))
@@ -448,24 +1482,22 @@ def create_file_info_embed(record, playlist_details, is_mod=False):
     embed.add_field(name="\u200b", value="\u200b", inline=True)
     
     # Row 4: Supporter Updates, Last Supporter Update + spacer
-    last_update_provider = record.get('last_update_provider')
-    
     if auto_update:
         embed.add_field(
             name="Supporter Updates",
             value="✅ Enabled",
             inline=True
         )
-        thank_msg = playlist_details.get('thank_message') if playlist_details else None
+        thank_msg = playlist_details.thank_message if playlist_details else None
         if thank_msg:
             info_messages.append(thank_msg)
         else:
             info_messages.append(MESSAGES["SUPPORTER_THANK_MSG_GENERIC"])
         
-        if not last_update_provider or last_update_provider == "NULL":
+        if not provider_dt:
             info_messages.append(MESSAGES["SUPPORTER_MISS_MSG"])
         else:
-            is_old = check_timestamp_age(last_update_provider, 36)
+            is_old = check_timestamp_age(provider_dt, 36)
             if is_old:
                 info_messages.append(MESSAGES["SUPPORTER_SYNCLAG_MSG"])
     else:
@@ -475,8 +1507,8 @@ def create_file_info_embed(record, playlist_details, is_mod=False):
             inline=True
         )
         
-        donation_url = playlist_details.get('donation_url') if playlist_details else None
-        pl_owner = playlist_details.get('pl_owner') if playlist_details else None
+        donation_url = playlist_details.donation_url if playlist_details else None
+        pl_owner = playlist_details.owner if playlist_details else None
         if donation_url:
             donation_msg = MESSAGES["SUPPORTER_DONATION_MSG"].format(
                 donation_url=donation_url,
@@ -486,21 +1518,13 @@ def create_file_info_embed(record, playlist_details, is_mod=False):
         else:
             info_messages.append("⚠️ Supporter updates are currently unavailable for this playlist. Please check back later or contact a mod.")
     
-    if last_update_provider and last_update_provider != "NULL":
-        provider_dt = parse_timestamp(last_update_provider)
-        if provider_dt:
-            formatted = format_datetime(provider_dt)
-            embed.add_field(
-                name="Last Supporter Update",
-                value=formatted if formatted else "N/A",
-                inline=True
-            )
-        else:
-            embed.add_field(
-                name="Last Supporter Update",
-                value="N/A",
-                inline=True
-            )
+    if provider_dt:
+        formatted = format_datetime(provider_dt)
+        embed.add_field(
+            name="Last Supporter Update",
+            value=formatted if formatted else "N/A",
+            inline=True
+        )
     else:
         embed.add_field(
             name="Last Supporter Update",
@@ -511,11 +1535,10 @@ def create_file_info_embed(record, playlist_details, is_mod=False):
     embed.add_field(name="\u200b", value="\u200b", inline=True)
     
     # Row 5: Last Owner Update, Creation Date, Playlist Key
-    pl_owner_name = playlist_details.get('pl_owner') if playlist_details else None
-    if pl_owner_name and pl_owner_last_update_str:
-        pl_owner_dt = parse_timestamp(pl_owner_last_update_str)
-        if pl_owner_dt:
-            formatted = format_datetime(pl_owner_dt)
+    pl_owner_name = playlist_details.owner if playlist_details else None
+    if pl_owner_name:
+        if pl_owner_last_update:
+            formatted = format_datetime(pl_owner_last_update)
             embed.add_field(
                 name=f"Last {pl_owner_name} Update",
                 value=formatted if formatted else "N/A",
@@ -550,7 +1573,7 @@ def create_file_info_embed(record, playlist_details, is_mod=False):
     
     embed.add_field(
         name="Playlist Key",
-        value=f"`{record.get('id')}`",
+        value=f"`{record.id}`",
         inline=True
     )
     
@@ -558,19 +1581,19 @@ def create_file_info_embed(record, playlist_details, is_mod=False):
     if is_mod:
         embed.add_field(
             name="File ID",
-            value=f"`{record.get('drive_file_id')}`",
+            value=f"`{record.drive_file_id}`",
             inline=True
         )
         
         embed.add_field(
             name="Discord User ID",
-            value=f"`{record.get('discord_id')}`",
+            value=f"`{record.discord_id}`",
             inline=True
         )
         
         embed.add_field(
             name="File Owner",
-            value=record.get('file_owner') or "N/A",
+            value=record.file_owner or "N/A",
             inline=True
         )
     
@@ -603,36 +1626,36 @@ async def register_file_async(file_identifier, duid):
         "duid": duid
     }
     
-    async with aiohttp.ClientSession() as session:
-        try:
-            async with session.post(
-                POST_API_URL, 
-                headers=headers, 
-                json=data,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                elif response.status == 404:
-                    error_data = await response.json()
-                    return {"status": "not_found", "error_detail": error_data.get("error")}
-                else:
-                    text = await response.text()
-                    print(f"Error: {response.status} - {text}")
-                    return {
-                        "error": "api_error",
-                        "status": response.status,
-                        "message": text
-                    }
-        except asyncio.TimeoutError:
-            print(f"Request timed out for file {file_id}")
-            return {"error": "timeout"}
-        except Exception as e:
-            print(f"Request failed: {e}")
-            return {"error": "request_failed", "exception": str(e)}
+    session = await get_http_session()
+    try:
+        async with session.post(
+            POST_API_URL, 
+            headers=headers, 
+            json=data,
+            timeout=HTTP_TIMEOUTS["api"]
+        ) as response:
+            if response.status == 200:
+                return parse_file_response(await response.json())
+            elif response.status == 404:
+                error_data = await response.json()
+                return {"status": "not_found", "error_detail": error_data.get("error")}
+            else:
+                text = await response.text()
+                print(f"Error: {response.status} - {text}")
+                return {
+                    "error": "api_error",
+                    "status": response.status,
+                    "message": text
+                }
+    except asyncio.TimeoutError:
+        print(f"Request timed out for file {file_id}")
+        return {"error": "timeout"}
+    except Exception as e:
+        print(f"Request failed: {e}")
+        return {"error": "request_failed", "exception": str(e)}
 
 
-def handle_registration_response(result, playlists_data=None):
+def handle_registration_response(result, catalog=None):
     """Process registration API response and return appropriate message"""
     if not result:
         return REGISTER_MESSAGES["PL_REG_ERROR_MSG"], None
@@ -659,16 +1682,15 @@ def handle_registration_response(result, playlists_data=None):
         if not record:
             return "✅ Registration successful! Your playlist has been registered.", None
         
-        list_id = record.get("list_id")
+        list_id = record.list_id
         provider = "N/A"
         pl_owner = "N/A"
         
-        if playlists_data and list_id:
-            for playlist in playlists_data:
-                if playlist.get("id") == list_id:
-                    provider = playlist.get("service_name", "N/A")
-                    pl_owner = playlist.get("reddit_user", "N/A")
-                    break
+        if catalog and list_id:
+            playlist_details = catalog.get(list_id)
+            if playlist_details:
+                provider = playlist_details.provider or "N/A"
+                pl_owner = playlist_details.owner or "N/A"
         
         message = REGISTER_MESSAGES["PL_REG_THANK_MSG"].format(
             pl_owner=pl_owner,
@@ -683,6 +1705,71 @@ def handle_registration_response(result, playlists_data=None):
 # PROVIDER SERVICEINFO API CALLS
 # ============================================================================      
 
+SERVICEINFO_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+serviceinfo_probe_slots = asyncio.Semaphore(SERVICEINFO_MAX_PROBES)
+
+async def read_limited_body(response, max_bytes):
+    """Read a response body, returning None if it exceeds max_bytes"""
+    if response.content_length is not None and response.content_length > max_bytes:
+        return None
+    
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(8192):
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            return None
+    return bytes(body)
+
+async def fetch_player_api(dns, username, password):
+    """Request player_api.php from a provider panel"""
+    url = f"{dns}/player_api.php"
+    params = {
+        "username": username,
+        "password": password
+    }
+    
+    session = await get_http_session()
+    async with session.get(
+        url,
+        params=params,
+        headers=SERVICEINFO_HEADERS,
+        timeout=aiohttp.ClientTimeout(total=SERVICEINFO_PROBE_DEADLINE)
+    ) as response:
+        if response.status != 200:
+            print(f"Service info probe failed: HTTP {response.status}")
+            return None
+        
+        body = await read_limited_body(response, SERVICEINFO_MAX_BYTES)
+        if body is None:
+            print(f"Service info probe failed: response larger than {SERVICEINFO_MAX_BYTES} bytes")
+            return None
+        
+        data = json.loads(body)
+        return data if isinstance(data, dict) else None
+
+async def fetch_player_api_in_slot(dns, username, password):
+    """Wait for a free probe slot, then fetch"""
+    async with serviceinfo_probe_slots:
+        return await fetch_player_api(dns, username, password)
+
+async def probe_player_api(dns, username, password):
+    """Probe a provider panel without blocking the event loop"""
+    # Queuing for a slot counts against the same deadline as the request itself
+    try:
+        return await asyncio.wait_for(
+            fetch_player_api_in_slot(dns, username, password),
+            timeout=SERVICEINFO_PROBE_DEADLINE
+        )
+    except asyncio.TimeoutError:
+        print(f"Service info probe timed out after {SERVICEINFO_PROBE_DEADLINE} seconds")
+        return None
+    except Exception as e:
+        print(f"Service info probe failed: {e}")
+        return None
+
 class ServiceInfoModal(Modal, title="Service Information"):  
     dns = TextInput(
         label="DNS/URL",
@@ -709,18 +1796,10 @@ class ServiceInfoModal(Modal, title="Service Information"):
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
 
-        url = f"{self.dns.value}/player_api.php?username={self.username.value}&password={self.password.value}"
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-
         try:
-            response = requests.get(url, headers=headers, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
+            data = await probe_player_api(self.dns.value, self.username.value, self.password.value)
 
+            if data is not None:
                 user_info = data.get('user_info', {})
                 server_info = data.get('server_info', {})
 
@@ -733,7 +1812,7 @@ class ServiceInfoModal(Modal, title="Service Information"):
                 cred_text += f"**Password:** ||{user_info.get('password', 'N/A')}||"
                 cred_embed.description = cred_text
 
-                await interaction.followup.send(embed=cred_embed, ephemeral=True)
+                await send_followup(interaction, embed=cred_embed, ephemeral=True)
 
                 embed = discord.Embed(
                     title="📊 Service Information",
@@ -781,16 +1860,18 @@ class ServiceInfoModal(Modal, title="Service Information"):
 
                 embed.add_field(name="\u200b", value=server_text, inline=False)
 
-                await interaction.followup.send(embed=embed, ephemeral=True)
+                await send_followup(interaction, embed=embed, ephemeral=True)
 
             else:
-                await interaction.followup.send(
+                await send_followup(
+                    interaction,
                     "❌ Unable to retrieve service information. Please check your DNS and credentials and try again.",
                     ephemeral=True
                 )
 
         except Exception:
-            await interaction.followup.send(
+            await send_followup(
+                interaction,
                 "❌ Unable to retrieve service information. Please check your DNS and credentials and try again.",
                 ephemeral=True
             )
@@ -808,11 +1889,14 @@ async def playlistregister(interaction: discord.Interaction, playlist: str):
     
     result = await register_file_async(playlist, duid)
     
-    playlists_data = await fetch_playlists_data()
+    if result.get("status") == "ok":
+        invalidate_user_lookup(duid)
     
-    message, record = handle_registration_response(result, playlists_data)
+    catalog = await get_playlists()
     
-    await interaction.followup.send(message, ephemeral=True)
+    message, record = handle_registration_response(result, catalog)
+    
+    await send_followup(interaction, message, ephemeral=True)
 
 # ============================================================================
 # BOT /PLAYLISTINFO COMMAND
@@ -826,32 +1910,34 @@ async def playlistinfo(interaction: discord.Interaction):
     result = await get_all_user_playlists(duid)
     
     if result is None:
-        await interaction.followup.send(
+        await send_followup(
+            interaction,
             MESSAGES["USER_LOOKUP_TIMEOUT_MSG"],
             ephemeral=True
         )
         return
     
     if not isinstance(result, list) or len(result) == 0:
-        await interaction.followup.send(
+        await send_followup(
+            interaction,
             MESSAGES["USER_LOOKUP_ERROR_MSG"],
             ephemeral=True
         )
         return
     
-    playlists_data = await fetch_playlists_data()
+    catalog = await get_playlists()
     
     if len(result) == 1:
         record = result[0]
-        list_id = record.get('list_id')
-        playlist_details = get_playlist_details(list_id, playlists_data)
+        playlist_details = get_playlist_details(record.list_id, catalog)
         embed = create_file_info_embed(record, playlist_details, is_mod=False)
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await send_followup(interaction, embed=embed, ephemeral=True)
     else:
-        view = PlaylistPaginationView(result, playlists_data, is_mod=False)
+        view = PlaylistPaginationView(result, catalog, is_mod=False)
         embed = view.get_embed()
-        message = await interaction.followup.send(embed=embed, view=view, ephemeral=True)
+        message = await send_followup(interaction, embed=embed, view=view, ephemeral=True)
         view.message = message
+        view.prerender_neighbours()
 
 # ============================================================================
 # BOT /PLAYLISTINFOMOD COMMAND
@@ -872,26 +1958,26 @@ async def playlistinfomod(interaction: discord.Interaction, duid: str):
     result = await get_all_user_playlists(duid)
 
     if result is None:
-        await interaction.followup.send(MESSAGES["USER_LOOKUP_TIMEOUT_MSG"], ephemeral=False)
+        await send_followup(interaction, MESSAGES["USER_LOOKUP_TIMEOUT_MSG"], ephemeral=False)
         return
     
     if not isinstance(result, list) or len(result) == 0:
-        await interaction.followup.send(MESSAGES["USER_LOOKUP_ERROR_MSG"], ephemeral=False)
+        await send_followup(interaction, MESSAGES["USER_LOOKUP_ERROR_MSG"], ephemeral=False)
         return
     
-    playlists_data = await fetch_playlists_data()
+    catalog = await get_playlists()
     
     if len(result) == 1:
         record = result[0]
-        list_id = record.get("list_id")
-        playlist_details = get_playlist_details(list_id, playlists_data)
+        playlist_details = get_playlist_details(record.list_id, catalog)
         embed = create_file_info_embed(record, playlist_details, is_mod=True)
-        await interaction.followup.send(embed=embed, ephemeral=False)
+        await send_followup(interaction, embed=embed, ephemeral=False)
     else:
-        view = PlaylistPaginationView(result, playlists_data, is_mod=True)
+        view = PlaylistPaginationView(result, catalog, is_mod=True)
         embed = view.get_embed()
-        message = await interaction.followup.send(embed=embed, view=view, ephemeral=False)
+        message = await send_followup(interaction, embed=embed, view=view, ephemeral=False)
         view.message = message
+        view.prerender_neighbours()
 
 # ============================================================================
 # BOT /PLAYLISTINFOID COMMAND
@@ -909,14 +1995,16 @@ async def playlistinfoid(interaction: discord.Interaction, playlist: str):
     result = await get_file_info_async(playlist, duid)
     
     if not result:
-        await interaction.followup.send(
+        await send_followup(
+            interaction,
             MESSAGES["USER_LOOKUP_ERROR_MSG"],
             ephemeral=True
         )
         return
     
     if result.get('status') != 'ok':
-        await interaction.followup.send(
+        await send_followup(
+            interaction,
             MESSAGES["USER_LOOKUP_TIMEOUT_MSG"],
             ephemeral=True
         )
@@ -924,17 +2012,18 @@ async def playlistinfoid(interaction: discord.Interaction, playlist: str):
     
     record = result.get('file')
     if not record:
-        await interaction.followup.send(
+        await send_followup(
+            interaction,
             MESSAGES["USER_LOOKUP_ERROR_MSG"],
             ephemeral=True
         )
         return
     
-    playlists_data = await fetch_playlists_data()
-    playlist_details = get_playlist_details(record.get('list_id'), playlists_data)
+    catalog = await get_playlists()
+    playlist_details = get_playlist_details(record.list_id, catalog)
     
     embed = create_file_info_embed(record, playlist_details, is_mod=False)
-    await interaction.followup.send(embed=embed, ephemeral=True)
+    await send_followup(interaction, embed=embed, ephemeral=True)
 
 # ============================================================================
 # BOT /SERVICEINFO COMMAND
@@ -954,24 +2043,24 @@ async def serviceinfo(interaction: discord.Interaction):
 async def logoupdate(interaction: discord.Interaction):
     try:
         await interaction.response.defer(ephemeral=True)
-        global logo_cache, cache_timestamp
-        logo_cache = await fetch_logos_from_github()
-        cache_timestamp = time.time()
+        logos = await asyncio.shield(refresh_logos())
 
-        if logo_cache:
-            await interaction.followup.send(
-                f"Logo cache updated! Loaded {len(logo_cache)} logos.",
+        if logos:
+            await send_followup(
+                interaction,
+                f"Logo cache updated! Loaded {len(logos)} logos.",
                 ephemeral=True
             )
         else:
-            await interaction.followup.send(
+            await send_followup(
+                interaction,
                 "Failed to refresh logo cache. If this error persists, please notify @greenspeedracer.",
                 ephemeral=True
             )
     except Exception as e:
         import traceback; traceback.print_exc()
         try:
-            await interaction.followup.send(f"Error updating logo cache: {e}", ephemeral=True)
+            await send_followup(interaction, f"Error updating logo cache: {e}", ephemeral=True)
         except Exception:
             pass
 
@@ -979,8 +2068,82 @@ async def logoupdate(interaction: discord.Interaction):
 # KYZU LOGO REPOSITORY CALLS
 # ============================================================================              
 
-logo_cache = []
-cache_timestamp = 0
+logo_cache = {
+    "data": [],
+    "index": None,
+    "etag": None,
+    "tree_sha": None,
+    "timestamp": 0,
+    "ttl": 3600,
+    "refresh_task": None
+}
+
+class LogoIndex:
+    """Search index over logo names, built once per logo refresh"""
+    def __init__(self, logos):
+        self.logos = logos
+        self.names = [logo['name'].casefold() for logo in logos]
+        self.exact = {}
+        self.sorted_names = sorted((name, i) for i, name in enumerate(self.names))
+        self.trigrams = {}
+        
+        for i, name in enumerate(self.names):
+            self.exact.setdefault(name, logos[i])
+            for gram in {name[j:j + 3] for j in range(len(name) - 2)}:
+                self.trigrams.setdefault(gram, []).append(i)
+    
+    def exact_match(self, query):
+        """Get the logo whose name matches the query exactly (case-insensitive)"""
+        return self.exact.get(query.casefold())
+    
+    def prefix_hits(self, query):
+        """Indices of names starting with query, in name order"""
+        hits = []
+        start = bisect.bisect_left(self.sorted_names, (query, -1))
+        for name, i in self.sorted_names[start:]:
+            if not name.startswith(query):
+                break
+            hits.append(i)
+        return hits
+    
+    def infix_candidates(self, query):
+        """Indices of names that may contain query, narrowed by trigram postings"""
+        if len(query) < 3:
+            return range(len(self.names))
+        
+        postings = []
+        for gram in {query[j:j + 3] for j in range(len(query) - 2)}:
+            posting = self.trigrams.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+        return candidates
+    
+    def search(self, query, limit=25):
+        """Ranked substring search: prefix hits first, then infix hits"""
+        query = query.casefold()
+        if not query:
+            return self.logos[:limit]
+        
+        prefix = self.prefix_hits(query)
+        results = [self.logos[i] for i in prefix[:limit]]
+        if len(results) >= limit:
+            return results
+        
+        infix = []
+        for i in self.infix_candidates(query):
+            position = self.names[i].find(query)
+            if position > 0:
+                infix.append((position, self.names[i], i))
+        
+        for _, _, i in heapq.nsmallest(limit - len(results), infix):
+            results.append(self.logos[i])
+        return results
 
 class LogoSelectView(View):
     def __init__(self, logos):
@@ -1010,52 +2173,139 @@ class LogoSelectView(View):
     
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+TREE_SHA_PATTERN = re.compile(r'"sha"\s*:\s*"([0-9a-fA-F]+)"')
+
 async def fetch_logos_from_github() -> List[dict]:
-    url = "https://api.github.com/repos/K-yzu/Logos/git/trees/main?recursive=1"
-    
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status == 200:
-                data = await response.json()
-                logos = [
-                    {
-                        'name': item['path'].split('/')[-1].replace('.png', '').replace('.gif', ''),
-                        'path': item['path'],
-                        'url': f"https://raw.githubusercontent.com/K-yzu/Logos/main/{quote(item['path'])}" 
-                    }
-                    for item in data.get('tree', [])
-                    if item['type'] == 'blob' and (
-                        item['path'].lower().endswith('.png') or item['path'].lower().endswith('.gif')
-                    )
-                ]
-                return logos
-            return []
+    """Fetch the logo tree, revalidating with the cached ETag and tree SHA"""
+    headers = {}
+    if logo_cache["data"] and logo_cache["etag"]:
+        headers["If-None-Match"] = logo_cache["etag"]
+    
+    session = await get_http_session()
+    async with session.get(LOGOS_TREE_URL, headers=headers, timeout=HTTP_TIMEOUTS["github"]) as response:
+        if response.status == 304:
+            print("Logo tree not modified")
+            return logo_cache["data"]
+        if response.status == 200:
+            etag = response.headers.get("ETag")
+            stream = JsonArrayStream(response, key="tree")
+            sha_match = TREE_SHA_PATTERN.search(await stream.open())
+            tree_sha = sha_match.group(1) if sha_match else None
+            
+            if logo_cache["data"] and tree_sha and tree_sha == logo_cache["tree_sha"]:
+                print("Logo tree SHA unchanged")
+                logo_cache["etag"] = etag
+                return logo_cache["data"]
+            
+            logos = []
+            async for item in stream.items():
+                path = item['path']
+                if item['type'] == 'blob' and (path.lower().endswith('.png') or path.lower().endswith('.gif')):
+                    logos.append({
+                        'name': path.split('/')[-1].replace('.png', '').replace('.gif', ''),
+                        'path': path,
+                        'url': f"https://raw.githubusercontent.com/K-yzu/Logos/main/{quote(path)}" 
+                    })
+            if logos:
+                logo_cache["etag"] = etag
+                logo_cache["tree_sha"] = tree_sha
+            return logos
+        return []
+
+def write_logo_cache(cache_data):
+    write_atomic(LOGO_CACHE_FILE, json.dumps(cache_data).encode("utf-8"))
+
+async def save_logo_cache():
+    """Serialize and write the logo cache in a thread"""
+    try:
+        cache_data = {
+            "timestamp": logo_cache["timestamp"],
+            "etag": logo_cache["etag"],
+            "tree_sha": logo_cache["tree_sha"],
+            "logos": logo_cache["data"]
+        }
+        await asyncio.to_thread(write_logo_cache, cache_data)
+        print(f"Logo cache saved ({len(logo_cache['data'])} logos, tree {logo_cache['tree_sha']})")
+    except Exception as e:
+        print(f"Error saving logo cache: {e}")
 
-async def get_logo_list() -> List[dict]:
-    global logo_cache, cache_timestamp
-    import time
-    current_time = time.time()
-    
-    if not logo_cache or (current_time - cache_timestamp) > 3600:
-        logo_cache = await fetch_logos_from_github()
-        cache_timestamp = current_time
-    
-    return logo_cache
+def load_logo_cache():
+    try:
+        if not os.path.exists(LOGO_CACHE_FILE):
+            print("No logo cache file found")
+            return None
+        
+        with open(LOGO_CACHE_FILE, 'r') as f:
+            cache_data = json.load(f)
+        
+        logos = cache_data['logos']
+        logo_cache["data"] = logos
+        logo_cache["index"] = LogoIndex(logos)
+        logo_cache["etag"] = cache_data.get('etag')
+        logo_cache["tree_sha"] = cache_data.get('tree_sha')
+        logo_cache["timestamp"] = cache_data.get('timestamp', 0)
+        
+        age = timedelta(seconds=int(time.time() - logo_cache["timestamp"]))
+        print(f"Loaded {len(logos)} logos from cache (age: {age})")
+        return logos
+    except Exception as e:
+        print(f"Error loading logo cache: {e}")
+        return None
 
-async def logo_autocomplete(
-    interaction: discord.Interaction,
-    current: str
-) -> List[app_commands.Choice[str]]:
-    logos = await get_logo_list()
+async def update_logo_cache() -> List[dict]:
+    """Fetch logos from GitHub into the logo cache"""
+    try:
+        logos = await fetch_logos_from_github()
+    except Exception as e:
+        print(f"Error fetching logos: {e}")
+        return None
     
-    matching = [
-        logo for logo in logos
-        if current.lower() in logo['name'].lower()
-    ]
+    if logos:
+        changed = logos is not logo_cache["data"]
+        logo_cache["timestamp"] = time.time()
+        # A 304 or an unchanged tree SHA leaves the file as it is; the next
+        # start just revalidates once, which is cheap
+        if changed:
+            logo_cache["data"] = logos
+            logo_cache["index"] = LogoIndex(logos)
+            print(f"Cached {len(logos)} logos")
+            await save_logo_cache()
+        return logos
+    
+    print("Failed to fetch logos")
+    return None
+
+def refresh_logos():
+    """Start a logo cache refresh, or join the one already in flight"""
+    return start_refresh(logo_cache, update_logo_cache)
+
+async def get_logo_list() -> List[dict]:
+    """Serve logos from cache, revalidating in the background once stale"""
+    if not logo_cache["data"]:
+        cache_requests.inc(("logos", "miss"))
+        refresh_logos()
+    elif (time.time() - logo_cache["timestamp"]) > logo_cache["ttl"]:
+        cache_requests.inc(("logos", "stale"))
+        refresh_logos()
+    else:
+        cache_requests.inc(("logos", "hit"))
+    
+    return logo_cache["data"]
+
+async def get_logo_index() -> LogoIndex:
+    """Serve the logo search index, revalidating in the background once stale"""
+    await get_logo_list()
+    return logo_cache["index"] or LogoIndex([])
+
+async def logo_autocomplete(
+    interaction: discord.Interaction,
+    current: str
+) -> List[app_commands.Choice[str]]:
+    index = await get_logo_index()
     
     return [
         app_commands.Choice(name=logo['name'], value=logo['name'])
-        for logo in matching[:25]
+        for logo in index.search(current, limit=25)
     ]
 
 # ============================================================================
@@ -1067,9 +2317,9 @@ async def logo_autocomplete(
 async def logo_search(interaction: discord.Interaction, name: str):
     await interaction.response.defer(ephemeral=True)
     
-    logos = await get_logo_list()
+    index = await get_logo_index()
     
-    exact_match = next((logo for logo in logos if logo['name'].lower() == name.lower()), None)
+    exact_match = index.exact_match(name)
     
     if exact_match:
         embed = discord.Embed(
@@ -1080,53 +2330,314 @@ async def logo_search(interaction: discord.Interaction, name: str):
         embed.set_image(url=exact_match['url'])
         embed.add_field(name="Source", value="[📂 K-yzu's Logo Repository](https://github.com/K-yzu/Logos)", inline=False)
         
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await send_followup(interaction, embed=embed, ephemeral=True)
     else:
-        partial_matches = [
-            logo for logo in logos
-            if name.lower() in logo['name'].lower()
-        ]
+        partial_matches = index.search(name, limit=25)
         
         if partial_matches:
             view = LogoSelectView(partial_matches)
-            await interaction.followup.send("Select a logo:", view=view, ephemeral=True)
+            await send_followup(interaction, "Select a logo:", view=view, ephemeral=True)
         else:
-            await interaction.followup.send(
+            await send_followup(
+                interaction,
                 f"No logos found matching '{name}'", ephemeral=True)
 
 # ============================================================================
-# EPGENIUS.ORG DOWN DETECTOR
+# SITE DOWN DETECTOR
 # ============================================================================
 
-bot.last_repo_status = None
+def percentile(values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not values:
+        return None
+    rank = -(-pct * len(values) // 100)
+    return values[max(0, min(len(values), rank) - 1)]
+
+class ProbeHistory:
+    """Fixed-size ring buffer of probe results kept in typed arrays"""
+    FIELDS = (("timestamp", "d"), ("ok", "b"), ("dns", "f"), ("connect", "f"), ("ttfb", "f"), ("total", "f"))
+
+    def __init__(self, size=MONITOR_HISTORY_SIZE):
+        self.size = size
+        self.head = 0
+        self.count = 0
+        self.columns = {name: array(code, [0]) * size for name, code in self.FIELDS}
+
+    def append(self, timestamp, ok, dns, connect, ttfb, total):
+        i = self.head
+        columns = self.columns
+        columns["timestamp"][i] = timestamp
+        columns["ok"][i] = 1 if ok else 0
+        columns["dns"][i] = dns
+        columns["connect"][i] = connect
+        columns["ttfb"][i] = ttfb
+        columns["total"][i] = total
+        self.head = (i + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def positions(self, since=0):
+        """Ring positions from oldest to newest, skipping samples before `since`"""
+        timestamps = self.columns["timestamp"]
+        start = (self.head - self.count) % self.size
+        for n in range(self.count):
+            i = (start + n) % self.size
+            if timestamps[i] >= since:
+                yield i
+
+    def latencies(self, since=0):
+        """Sorted total times of successful probes"""
+        ok, total = self.columns["ok"], self.columns["total"]
+        return sorted(total[i] for i in self.positions(since) if ok[i])
+
+    def recent_latencies(self, n):
+        """Total times of the last `n` probes, or fewer if any of them failed"""
+        ok, total = self.columns["ok"], self.columns["total"]
+        result = []
+        for back in range(1, min(n, self.count) + 1):
+            i = (self.head - back) % self.size
+            if not ok[i]:
+                break
+            result.append(total[i])
+        return result
+
+    def last(self):
+        if not self.count:
+            return None
+        i = (self.head - 1) % self.size
+        return {name: self.columns[name][i] for name, _ in self.FIELDS}
+
+    def uptime(self, since, now, max_gap):
+        """Time-weighted share of the window the site answered, or None without data"""
+        timestamps, ok = self.columns["timestamp"], self.columns["ok"]
+        positions = list(self.positions(since))
+        up = observed = 0
+        for n, i in enumerate(positions):
+            end = timestamps[positions[n + 1]] if n + 1 < len(positions) else now
+            span = min(end - timestamps[i], max_gap)
+            observed += span
+            if ok[i]:
+                up += span
+        return up / observed if observed else None
+
+    def to_dict(self):
+        return {
+            "size": self.size,
+            "head": self.head,
+            "count": self.count,
+            "columns": {name: base64.b64encode(column.tobytes()).decode("ascii") for name, column in self.columns.items()}
+        }
 
-@tasks.loop(seconds=CHECK_INTERVAL)
-async def check_repo_status():
-    status_code, error_type, error_msg = await check_site_status(REPO_URL, TIMEOUT)
-    current_status = "UP" if status_code == 200 else "DOWN"
-    
-    if current_status != bot.last_repo_status:
-        if current_status == "DOWN":
-            await send_repo_alert(status_code, error_type, error_msg)
-        elif bot.last_repo_status is not None:
-            await send_repo_recovery_alert()
+    @classmethod
+    def from_dict(cls, data, size=MONITOR_HISTORY_SIZE):
+        saved = cls(data["size"])
+        for name, code in cls.FIELDS:
+            column = array(code)
+            column.frombytes(base64.b64decode(data["columns"][name]))
+            if len(column) != saved.size:
+                raise ValueError(f"column {name} has {len(column)} entries, expected {saved.size}")
+            saved.columns[name] = column
+        saved.head = data["head"]
+        saved.count = data["count"]
+        if saved.size == size:
+            return saved
         
-        bot.last_repo_status = current_status
+        # Ring size changed in config: replay the saved samples into a new buffer
+        history = cls(size)
+        for i in saved.positions():
+            history.append(*(saved.columns[name][i] for name, _ in cls.FIELDS))
+        return history
+
+class MonitorTarget:
+    def __init__(self, key, name, url, channel_id, mention, interval, timeout,
+                 confirm_failures=MONITOR_CONFIRM_FAILURES, confirm_window=MONITOR_CONFIRM_WINDOW,
+                 recovery_successes=MONITOR_RECOVERY_SUCCESSES, recheck_interval=MONITOR_RECHECK_INTERVAL,
+                 latency_threshold_ms=None):
+        self.key = key
+        self.name = name
+        self.url = url
+        self.channel_id = channel_id
+        self.mention = mention
+        self.interval = interval
+        self.timeout = timeout
+        self.confirm_failures = confirm_failures
+        self.recovery_successes = recovery_successes
+        self.recheck_interval = recheck_interval
+        self.samples = deque(maxlen=confirm_window)
+        self.successes = 0
+        self.paused = False
+        self.state = None
+        self.last_status = None
+        self.last_checked = None
+        self.last_error = None
+        self.next_check = 0
+        self.probe_task = None
+        self.history = ProbeHistory()
+        self.incidents = deque(maxlen=MONITOR_INCIDENT_LIMIT)
+        self.latency_threshold_ms = latency_threshold_ms
+        self.latency_degraded = False
+        self.baseline_ms = None
+        self.baseline_at = 0
+
+monitor_targets = {key: MonitorTarget(key, **config) for key, config in MONITOR_TARGETS.items()}
+monitor_history_state = {"dirty": False, "next_save": 0, "save_task": None}
+
+def monitor_history_snapshot():
+    return {
+        "targets": {
+            key: {"history": target.history.to_dict(), "incidents": list(target.incidents)}
+            for key, target in monitor_targets.items()
+        }
+    }
+
+def save_monitor_history(snapshot):
+    try:
+        write_atomic(MONITOR_HISTORY_FILE, json.dumps(snapshot).encode("utf-8"))
+    except Exception as e:
+        print(f"Error saving monitor history: {e}")
+
+def load_monitor_history():
+    try:
+        if not os.path.exists(MONITOR_HISTORY_FILE):
+            print("No monitor history file found")
+            return
+        
+        with open(MONITOR_HISTORY_FILE, 'r') as f:
+            saved = json.load(f)
+        
+        for key, data in saved.get("targets", {}).items():
+            target = monitor_targets.get(key)
+            if target is None:
+                continue
+            target.history = ProbeHistory.from_dict(data["history"])
+            target.incidents.extend(data.get("incidents", []))
+        print(f"Monitor history loaded for {len(saved.get('targets', {}))} targets")
+    except Exception as e:
+        print(f"Error loading monitor history: {e}")
+
+def schedule_monitor_history_save():
+    """Write the history file in a thread once the save interval has passed"""
+    state = monitor_history_state
+    now = time.monotonic()
+    if not state["dirty"] or now < state["next_save"]:
+        return
+    if state["save_task"] is not None and not state["save_task"].done():
+        return
+    state["dirty"] = False
+    state["next_save"] = now + MONITOR_HISTORY_SAVE_INTERVAL
+    state["save_task"] = asyncio.create_task(asyncio.to_thread(save_monitor_history, monitor_history_snapshot()))
+
+@tasks.loop(seconds=MONITOR_TICK)
+async def monitor_scheduler():
+    """Start a probe for every running target that is due"""
+    now = time.monotonic()
+    for target in monitor_targets.values():
+        if target.paused or now < target.next_check:
+            continue
+        if target.probe_task is not None and not target.probe_task.done():
+            continue
+        target.next_check = now + target.interval
+        target.probe_task = asyncio.create_task(probe_target(target))
+    
+    schedule_monitor_history_save()
 
-@check_repo_status.before_loop
-async def before_check_repo_status():
+@monitor_scheduler.before_loop
+async def before_monitor_scheduler():
     await bot.wait_until_ready()
 
-async def check_site_status(url, timeout):
+async def probe_target(target):
+    timings = {}
+    status_code, error_type, error_msg = await check_site_status(target.url, target.timeout, timings)
+    if target.paused:
+        return
+    
+    ok = status_code == 200
+    target.last_checked = datetime.now(timezone.utc)
+    target.last_error = None if ok else (error_msg or error_type)
+    target.samples.append(ok)
+    target.history.append(target.last_checked.timestamp(), ok, *probe_phases(timings))
+    monitor_history_state["dirty"] = True
+    
+    if target.last_status == "DOWN":
+        # Hysteresis: require consecutive successes before declaring recovery
+        target.successes = target.successes + 1 if ok else 0
+        if target.successes >= target.recovery_successes:
+            target.state = target.last_status = "UP"
+            target.samples.clear()
+            if target.incidents and target.incidents[-1]["end"] is None:
+                target.incidents[-1]["end"] = target.last_checked.timestamp()
+            send_monitor_recovery_alert(target)
+        else:
+            target.state = "RECOVERING" if ok else "DOWN"
+    elif target.samples.count(False) >= target.confirm_failures:
+        target.state = target.last_status = "DOWN"
+        target.successes = 0
+        target.incidents.append({"start": target.last_checked.timestamp(), "end": None, "error": target.last_error[:100]})
+        send_monitor_alert(target, status_code, error_type, error_msg)
+    elif False in target.samples:
+        target.state = "SUSPECT"
+    else:
+        target.state = target.last_status = "UP"
+        check_latency(target)
+    
+    # Re-probe quickly while a transition is being confirmed
+    if target.state in ("SUSPECT", "RECOVERING"):
+        target.next_check = time.monotonic() + target.recheck_interval
+
+def probe_phases(timings):
+    """DNS, connect, time-to-first-byte and total in milliseconds from trace marks"""
+    # The pooled session skips DNS on a cache hit and connect on a reused
+    # connection; those phases are stored as NaN rather than a fake 0 ms
+    def span(start, end):
+        if start in timings and end in timings:
+            return (timings[end] - timings[start]) * 1000
+        return math.nan
+    return (
+        span("dns_start", "dns_end"),
+        span("connect_start", "connect_end"),
+        span("request_start", "response_start"),
+        span("probe_start", "probe_end")
+    )
+
+def check_latency(target):
+    """Alert when recent response times drift well above the site's 24h baseline"""
+    recent = target.history.recent_latencies(MONITOR_LATENCY_SAMPLES)
+    if len(recent) < MONITOR_LATENCY_SAMPLES:
+        return
+    
+    now = time.time()
+    if target.latency_threshold_ms is None and now >= target.baseline_at:
+        latencies = target.history.latencies(now - 86400)
+        if len(latencies) >= MONITOR_BASELINE_MIN_SAMPLES:
+            target.baseline_ms = percentile(latencies, 50)
+            target.baseline_at = now + MONITOR_BASELINE_REFRESH
+    
+    if target.latency_threshold_ms is not None:
+        threshold = target.latency_threshold_ms
+    elif target.baseline_ms is not None:
+        threshold = max(MONITOR_LATENCY_FLOOR_MS, target.baseline_ms * MONITOR_LATENCY_FACTOR)
+    else:
+        return
+    
+    current = sorted(recent)[len(recent) // 2]
+    if not target.latency_degraded and current > threshold:
+        target.latency_degraded = True
+        send_latency_alert(target, current, threshold)
+    elif target.latency_degraded and current < threshold * MONITOR_LATENCY_CLEAR_RATIO:
+        target.latency_degraded = False
+        send_latency_recovery_alert(target, current)
+
+async def check_site_status(url, timeout, timings=None):
+    if timings is not None:
+        timings["probe_start"] = time.perf_counter()
     try:
         timeout_config = aiohttp.ClientTimeout(total=timeout)
-        async with aiohttp.ClientSession(timeout=timeout_config) as session:
-            async with session.get(url) as response:
-                status = response.status
-                if status == 200:
-                    return (200, "OK", "")
-                else:
-                    return (status, f"HTTP_{status}", f"HTTP {status}")
+        session = await get_http_session()
+        async with session.get(url, timeout=timeout_config, trace_request_ctx=timings) as response:
+            status = response.status
+            if status == 200:
+                return (200, "OK", "")
+            else:
+                return (status, f"HTTP_{status}", f"HTTP {status}")
     except asyncio.TimeoutError:
         return (0, "TIMEOUT", f"Request timed out after {timeout} seconds")
     except aiohttp.ClientConnectorError as e:
@@ -1139,10 +2650,14 @@ async def check_site_status(url, timeout):
         return (0, "CLIENT_ERROR", f"Client error: {str(e)}")
     except Exception as e:
         return (0, "UNKNOWN_ERROR", f"Unexpected error: {type(e).__name__} - {str(e)}")
-
-async def send_repo_alert(status_code, error_type, error_msg):
-    if BOTLOGCHANNEL is None:
-        print(f"BOTLOGCHANNEL not initialized")
+    finally:
+        if timings is not None:
+            timings["probe_end"] = time.perf_counter()
+
+def send_monitor_alert(target, status_code, error_type, error_msg):
+    channel = bot.get_channel(target.channel_id)
+    if channel is None:
+        print(f"Alert channel {target.channel_id} for {target.name} not found")
         return
     
     if status_code == 0:
@@ -1155,8 +2670,8 @@ async def send_repo_alert(status_code, error_type, error_msg):
         details = None if error_type == f"HTTP_{status_code}" else error_msg
 
     embed = discord.Embed(
-        title="🚨 EPGenius Server Down Alert",
-        description=f"{REPO_URL}",
+        title=f"🚨 {target.name} Server Down Alert",
+        description=f"{target.url}",
         color=discord.Color.red()
     )
     embed.add_field(name="Status Code", value=status_display, inline=True)
@@ -1164,82 +2679,52 @@ async def send_repo_alert(status_code, error_type, error_msg):
     if details:
         embed.add_field(name="Details", value=details, inline=False)
 
-    await BOTLOGCHANNEL.send(content=MOD_MENTIONS, embed=embed)
+    outbound.queue_alert(channel, target.mention, embed)
 
-async def send_repo_recovery_alert():
-    if BOTLOGCHANNEL is None:
+def send_monitor_recovery_alert(target):
+    channel = bot.get_channel(target.channel_id)
+    if channel is None:
         return
     
     embed = discord.Embed(
-        title="✅ EPGenius Server Recovered",
-        description=f"EPGenius server {REPO_URL} is back online",
+        title=f"✅ {target.name} Server Recovered",
+        description=f"{target.name} server {target.url} is back online",
         color=discord.Color.green()
     )
     embed.add_field(name="Status", value="200 OK", inline=False)
     
-    await BOTLOGCHANNEL.send(content=MOD_MENTIONS, embed=embed)
-
-# ============================================================================
-# STREAMCHECK.PRO DOWN DETECTOR
-# ============================================================================
-
-bot.last_sc_status = None
-
-@tasks.loop(seconds=CHECK_INTERVAL)
-async def check_sc_status():
-    status_code, error_type, error_msg = await check_site_status(SC_URL, TIMEOUT)
-    current_status = "UP" if status_code == 200 else "DOWN"
-    
-    if current_status != bot.last_sc_status:
-        if current_status == "DOWN":
-            await send_sc_alert(status_code, error_type, error_msg)
-        elif bot.last_sc_status is not None:
-            await send_sc_recovery_alert()
-        
-        bot.last_sc_status = current_status
+    outbound.queue_alert(channel, target.mention, embed)
 
-@check_sc_status.before_loop
-async def before_check_sc_status():
-    await bot.wait_until_ready()
-
-async def send_sc_alert(status_code, error_type, error_msg):
-    if SC_UPDATES_CHANNEL is None:
-        print(f"SC_UPDATES_CHANNEL not initialized")
+def send_latency_alert(target, current_ms, threshold_ms):
+    channel = bot.get_channel(target.channel_id)
+    if channel is None:
         return
     
-    if status_code == 0:
-        status_display = "N/A (Connection Failed)"
-        main_error = error_type.replace('_', ' ').title()
-        details = error_msg
-    else:
-        status_display = str(status_code)
-        main_error = f"HTTP {status_code}"
-        details = None if error_type == f"HTTP_{status_code}" else error_msg
-
     embed = discord.Embed(
-        title="🚨 StreamCheck Server Down Alert",
-        description=f"{SC_URL}",
-        color=discord.Color.red()
+        title=f"🐢 {target.name} Server Slow",
+        description=f"{target.url} is responding slower than usual",
+        color=discord.Color.orange()
     )
-    embed.add_field(name="Status Code", value=status_display, inline=True)
-    embed.add_field(name="Error", value=main_error, inline=True)
-    if details:
-        embed.add_field(name="Details", value=details, inline=False)
-
-    await SC_UPDATES_CHANNEL.send(content=GSR_MENTION, embed=embed)
+    embed.add_field(name="Recent Median", value=f"{current_ms:.0f} ms", inline=True)
+    embed.add_field(name="Threshold", value=f"{threshold_ms:.0f} ms", inline=True)
+    if target.baseline_ms is not None:
+        embed.add_field(name="24h Median", value=f"{target.baseline_ms:.0f} ms", inline=True)
+    
+    outbound.queue_alert(channel, target.mention, embed)
 
-async def send_sc_recovery_alert():
-    if SC_UPDATES_CHANNEL is None:
+def send_latency_recovery_alert(target, current_ms):
+    channel = bot.get_channel(target.channel_id)
+    if channel is None:
         return
     
     embed = discord.Embed(
-        title="✅ StreamCheck Server Recovered",
-        description=f"StreamCheck server {SC_URL} is back online",
+        title=f"✅ {target.name} Response Time Normal",
+        description=f"{target.url} response times are back to normal",
         color=discord.Color.green()
     )
-    embed.add_field(name="Status", value="200 OK", inline=False)
+    embed.add_field(name="Recent Median", value=f"{current_ms:.0f} ms", inline=False)
     
-    await SC_UPDATES_CHANNEL.send(content=GSR_MENTION, embed=embed)
+    outbound.queue_alert(channel, target.mention, embed)
 
 # ============================================================================
 # EPGENIUS.ORG PLAYLIST API CALLS
@@ -1247,82 +2732,158 @@ async def send_sc_recovery_alert():
 
 async def fetch_playlists():
     try:
-        timeout_config = aiohttp.ClientTimeout(total=10)
-        async with aiohttp.ClientSession(timeout=timeout_config) as session:
-            async with session.get(PLAYLISTS_URL) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    playlists = []
-                    for item in data:
-                        playlists.append({
-                            "number": item["id"],
-                            "owner": item["reddit_user"] if item["reddit_user"] != "N/A" else None,
-                            "provider": item["service_name"],
-                            "epg_url": item["github_epg_url"]
-                        })
-                    return playlists
-                else:
-                    print(f"Failed to fetch playlists: HTTP {response.status}")
-                    return None
+        session = await get_http_session()
+        async with session.get(PLAYLISTS_URL, timeout=HTTP_TIMEOUTS["catalog"]) as response:
+            if response.status == 200:
+                catalog = PlaylistCatalog([])
+                async for item in JsonArrayStream(response).items():
+                    catalog.add(item)
+                return catalog
+            else:
+                print(f"Failed to fetch playlists: HTTP {response.status}")
+                return None
     except Exception as e:
         print(f"Error fetching playlists: {e}")
         return None
 
-def save_playlist_cache(playlists):
+def write_atomic(path, data):
+    """Write bytes to a temp file next to `path`, fsync it, then rename over `path`"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
     try:
-        cache_data = {
-            "timestamp": datetime.now().isoformat(),
-            "playlists": playlists
-        }
-        with open(PLAYLIST_CACHE_FILE, 'w') as f:
-            json.dump(cache_data, f)
-        print(f"Playlist cache saved at {cache_data['timestamp']}")
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+def write_playlist_cache(catalog, previous_hash):
+    """Serialize, hash and write the catalog; returns the new hash or None if unchanged"""
+    items_json = json.dumps(catalog.to_items(), separators=(",", ":"))
+    content_hash = hashlib.sha256(items_json.encode("utf-8")).hexdigest()
+    if content_hash == previous_hash:
+        return None
+    
+    timestamp = datetime.now().isoformat()
+    payload = f'{{"timestamp":{json.dumps(timestamp)},"hash":"{content_hash}","items":{items_json}}}'
+    write_atomic(PLAYLIST_CACHE_FILE, gzip.compress(payload.encode("utf-8"), compresslevel=PLAYLIST_CACHE_COMPRESSLEVEL, mtime=0))
+    print(f"Playlist cache saved at {timestamp} ({len(catalog)} playlists)")
+    return content_hash
+
+async def save_playlist_cache_soon():
+    """Debounced writer: waits, then writes the latest pending catalog off the loop"""
+    await asyncio.sleep(PLAYLIST_CACHE_SAVE_DELAY)
+    await flush_playlist_cache()
+
+async def flush_playlist_cache():
+    catalog = playlist_cache_file["pending"]
+    if catalog is None:
+        return
+    playlist_cache_file["pending"] = None
+    try:
+        content_hash = await asyncio.to_thread(write_playlist_cache, catalog, playlist_cache_file["hash"])
+        if content_hash is not None:
+            playlist_cache_file["hash"] = content_hash
     except Exception as e:
         print(f"Error saving playlist cache: {e}")
 
-def load_playlist_cache():
+def save_playlist_cache(catalog):
+    """Queue a snapshot of the catalog; only the latest one within the debounce window is written"""
+    playlist_cache_file["pending"] = catalog
+    task = playlist_cache_file["save_task"]
+    if task is None or task.done():
+        playlist_cache_file["save_task"] = asyncio.create_task(save_playlist_cache_soon())
+
+def legacy_playlist_item(playlist):
+    """Map an old {number, owner, provider, epg_url} cache entry to the PLAYLISTS_URL item shape"""
+    return {
+        'id': playlist.get('number'),
+        'reddit_user': playlist.get('owner'),
+        'service_name': playlist.get('provider'),
+        'github_epg_url': playlist.get('epg_url')
+    }
+
+def read_playlist_cache():
+    """Read the disk snapshot, falling back to the old plain JSON file"""
+    if os.path.exists(PLAYLIST_CACHE_FILE):
+        with open(PLAYLIST_CACHE_FILE, 'rb') as f:
+            cache_data = json.loads(gzip.decompress(f.read()))
+        return cache_data, PlaylistCatalog(cache_data['items'])
+    if os.path.exists(LEGACY_PLAYLIST_CACHE_FILE):
+        with open(LEGACY_PLAYLIST_CACHE_FILE, 'r') as f:
+            cache_data = json.load(f)
+        return cache_data, PlaylistCatalog(legacy_playlist_item(playlist) for playlist in cache_data['playlists'])
+    return None, None
+
+async def load_playlist_cache():
     try:
-        if not os.path.exists(PLAYLIST_CACHE_FILE):
+        cache_data, catalog = await asyncio.to_thread(read_playlist_cache)
+        if cache_data is None:
             print("No cache file found")
             return None
         
-        with open(PLAYLIST_CACHE_FILE, 'r') as f:
-            cache_data = json.load(f)
-        
         cache_time = datetime.fromisoformat(cache_data['timestamp'])
         age = datetime.now() - cache_time
+        playlist_cache_file["hash"] = cache_data.get("hash")
         
         print(f"Loading playlist cache from {cache_data['timestamp']} (age: {age})")
-        return cache_data['playlists']
+        return catalog
     except Exception as e:
         print(f"Error loading playlist cache: {e}")
         return None
 
-async def get_playlists():
-    global CACHED_PLAYLISTS
-    
+async def update_playlist_cache():
+    """Fetch live playlist data into the playlist cache"""
     print("Attempting to fetch live playlist data...")
     live_playlists = await fetch_playlists()
     
     if live_playlists:
         print(f"Successfully fetched {len(live_playlists)} playlists from server")
-        CACHED_PLAYLISTS = live_playlists
+        playlist_cache["data"] = live_playlists
+        playlist_cache["timestamp"] = time.time()
         save_playlist_cache(live_playlists)
         return live_playlists
     
-    print("Live fetch failed, attempting to load cache...")
-    
-    if CACHED_PLAYLISTS:
-        print(f"Using in-memory cached playlists ({len(CACHED_PLAYLISTS)} playlists)")
-        return CACHED_PLAYLISTS
-    
-    cached_playlists = load_playlist_cache()
+    print("Live fetch failed")
+    return None
+
+def refresh_playlists():
+    """Start a playlist cache refresh, or join the one already in flight"""
+    return start_refresh(playlist_cache, update_playlist_cache)
+
+async def get_playlists():
+    """Serve playlists from cache, revalidating in the background once stale"""
+    cached_playlists = playlist_cache["data"]
+    cache_result = "hit"
+    
+    if not cached_playlists:
+        cached_playlists = await load_playlist_cache()
+        if playlist_cache["data"]:
+            # A live refresh landed while the file was being read
+            cached_playlists = playlist_cache["data"]
+        elif cached_playlists:
+            print(f"Using file cached playlists ({len(cached_playlists)} playlists)")
+            playlist_cache["data"] = cached_playlists
+            playlist_cache["timestamp"] = 0
+            cache_result = "disk"
     
     if cached_playlists:
-        print(f"Using file cached playlists ({len(cached_playlists)} playlists)")
-        CACHED_PLAYLISTS = cached_playlists
+        if time.time() - playlist_cache["timestamp"] >= playlist_cache["ttl"]:
+            if cache_result == "hit":
+                cache_result = "stale"
+            refresh_playlists()
+        cache_requests.inc(("catalog", cache_result))
         return cached_playlists
     
+    cache_requests.inc(("catalog", "miss"))
+    live_playlists = await asyncio.shield(refresh_playlists())
+    if live_playlists:
+        return live_playlists
+    
     print("ERROR: No playlist data available (live fetch failed and no cache exists)")
     return None
 
@@ -1334,14 +2895,14 @@ class OwnerSelect(Select):
 
     async def callback(self, interaction: discord.Interaction):
         selected_owner = self.values[0]
-        matched_playlists = [p for p in self.playlists if p.get("owner") == selected_owner]
+        matched_playlists = self.playlists.find_owner(selected_owner)
 
         embed = discord.Embed(title=f"Playlists for owner '{selected_owner}'", color=discord.Color.blue())
         for p in matched_playlists:
-            epg_url = p.get("epg_url", "No EPG URL")
+            epg_url = p.epg_url or "No EPG URL"
             embed.add_field(
-                name=f"#{p['number']} - {selected_owner}",
-                value=f"Provider: {p.get('provider', 'N/A')}\nEPG: {epg_url}",
+                name=f"#{p.number} - {selected_owner}",
+                value=f"Provider: {p.provider or 'N/A'}\nEPG: {epg_url}",
                 inline=False,
             )
         await interaction.response.edit_message(embed=embed, view=None)
@@ -1351,6 +2912,182 @@ class OwnerSelectView(View):
         super().__init__(timeout=60)
         self.add_item(OwnerSelect(owners, playlists))    
 
+class PlaylistJumpModal(Modal, title="Jump to Page"):
+    page = TextInput(
+        label="Page Number",
+        placeholder="1",
+        required=True,
+        max_length=6
+    )
+
+    def __init__(self, list_view):
+        super().__init__()
+        self.list_view = list_view
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            page = int(self.page.value) - 1
+        except ValueError:
+            await interaction.response.send_message("Please enter a valid page number.", ephemeral=True)
+            return
+        
+        self.list_view.current_page = min(max(page, 0), self.list_view.max_page)
+        self.list_view.update_buttons()
+        await interaction.response.edit_message(embed=self.list_view.get_embed(), view=self.list_view)
+
+class PlaylistSearchModal(Modal, title="Search Playlists"):
+    query = TextInput(
+        label="Owner, Provider or Playlist Number",
+        placeholder="Leave empty to show all playlists",
+        required=False,
+        max_length=100
+    )
+
+    def __init__(self, list_view):
+        super().__init__()
+        self.list_view = list_view
+
+    async def on_submit(self, interaction: discord.Interaction):
+        await self.list_view.apply_search(self.query.value)
+        self.list_view.update_buttons()
+        await interaction.response.edit_message(embed=self.list_view.get_embed(), view=self.list_view)
+
+class PlaylistListView(View):
+    def __init__(self, catalog):
+        super().__init__(timeout=180)
+        self.catalog = catalog
+        self.playlists = catalog.playlists
+        self.search_query = None
+        self.current_page = 0
+        self.message = None
+
+    @property
+    def max_page(self):
+        return max(0, (len(self.playlists) - 1) // EPG_LIST_PAGE_SIZE)
+
+    async def on_timeout(self):
+        """Called when the view times out"""
+        if self.message:
+            try:
+                await self.message.edit(view=None)
+            except:
+                pass
+
+    async def apply_search(self, query):
+        """Filter the list by owner, provider or playlist number"""
+        query = query.strip()
+        self.current_page = 0
+        
+        if not query:
+            self.search_query = None
+            self.playlists = self.catalog.playlists
+            return
+        
+        self.search_query = query
+        self.playlists = await run_cpu(
+            "epg_list_search", self.catalog.filter, query,
+            fallback=lambda: self.catalog.filter_exact(query)
+        )
+
+    def get_embed(self):
+        """Generate embed for the current page only"""
+        title = f"Playlists matching '{self.search_query}'" if self.search_query else "All Playlists"
+        embed = discord.Embed(
+            title=f"{title} (Page {self.current_page + 1} of {self.max_page + 1})",
+            color=discord.Color.blue()
+        )
+        
+        start = self.current_page * EPG_LIST_PAGE_SIZE
+        for p in self.playlists[start:start + EPG_LIST_PAGE_SIZE]:
+            epg_display = p.epg_url if p.epg_url and p.epg_url.lower() not in ["n/a", "use provider's epg"] else "No EPG URL"
+            owner_display = p.owner or "N/A"
+            embed.add_field(
+                name=f"#{p.number} - {owner_display}",
+                value=f"Provider: {p.provider}\nEPG: {epg_display}",
+                inline=False
+            )
+        
+        if not self.playlists:
+            embed.description = "No playlists found."
+        embed.set_footer(text=f"{len(self.playlists)} playlists")
+        return embed
+
+    def update_buttons(self):
+        """Update button states based on current page"""
+        for item in self.children:
+            if isinstance(item, Button):
+                if "Previous" in item.label:
+                    item.disabled = (self.current_page == 0)
+                elif "Next" in item.label:
+                    item.disabled = (self.current_page == self.max_page)
+                elif "Jump" in item.label:
+                    item.disabled = (self.max_page == 0)
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.primary)
+    async def previous_button(self, interaction: discord.Interaction, button: Button):
+        if self.current_page > 0:
+            self.current_page -= 1
+            self.update_buttons()
+            await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.primary)
+    async def next_button(self, interaction: discord.Interaction, button: Button):
+        if self.current_page < self.max_page:
+            self.current_page += 1
+            self.update_buttons()
+            await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    @discord.ui.button(label="Jump", style=discord.ButtonStyle.secondary)
+    async def jump_button(self, interaction: discord.Interaction, button: Button):
+        await interaction.response.send_modal(PlaylistJumpModal(self))
+
+    @discord.ui.button(label="🔍 Search", style=discord.ButtonStyle.secondary)
+    async def search_button(self, interaction: discord.Interaction, button: Button):
+        await interaction.response.send_modal(PlaylistSearchModal(self))
+
+# ============================================================================
+# BACKGROUND REFRESH SCHEDULER
+# ============================================================================
+
+refresh_jobs = [
+    {"name": "playlists", "cache": playlist_cache, "refresh": refresh_playlists, "next_refresh": 0, "failures": 0},
+    {"name": "logos", "cache": logo_cache, "refresh": refresh_logos, "next_refresh": 0, "failures": 0},
+]
+
+def start_refresh(cache, update):
+    """Start a cache update task, or return the one already in flight"""
+    task = cache["refresh_task"]
+    if task is None or task.done():
+        task = asyncio.create_task(update())
+        cache["refresh_task"] = task
+    return task
+
+async def run_refresh_job(job):
+    """Refresh one dataset and schedule its next run with jitter or backoff"""
+    try:
+        result = await asyncio.shield(job["refresh"]())
+    except Exception as e:
+        print(f"Error refreshing {job['name']}: {e}")
+        result = None
+    
+    now = time.time()
+    if result:
+        job["failures"] = 0
+        refresh_at = job["cache"]["timestamp"] + job["cache"]["ttl"] * REFRESH_AHEAD_RATIO
+        job["next_refresh"] = max(now, refresh_at - random.uniform(0, REFRESH_JITTER))
+    else:
+        job["failures"] += 1
+        backoff = min(REFRESH_BACKOFF_BASE * 2 ** (job["failures"] - 1), REFRESH_BACKOFF_MAX)
+        job["next_refresh"] = now + backoff + random.uniform(0, REFRESH_JITTER)
+        print(f"Refresh of {job['name']} failed {job['failures']} time(s), retrying in {int(backoff)}s")
+
+@tasks.loop(seconds=REFRESH_TICK)
+async def refresh_scheduler():
+    now = time.time()
+    due = [job for job in refresh_jobs if now >= job["next_refresh"]]
+    if due:
+        await asyncio.gather(*(run_refresh_job(job) for job in due))
+
 # ============================================================================
 # BOT /PLAYLIST COMMAND
 # ============================================================================    
@@ -1370,163 +3107,172 @@ async def gdrive(interaction: discord.Interaction, url: str):
     await interaction.response.send_message(f"Playlist Export Link:\n{download_url}", ephemeral=True)
 
 # ============================================================================
-# BOT /DDPAUSE COMMAND (EPGenius)
+# BOT /DDPAUSE COMMAND
 # ============================================================================  
 
-bot.repo_detector_paused = False
+MONITOR_CHOICES = [app_commands.Choice(name=target.name, value=target.key) for target in monitor_targets.values()]
 
-@bot.tree.command(name="ddpause", description="Pause EPGenius.org Down Detector")
+@bot.tree.command(name="ddpause", description="Pause a Down Detector")
+@app_commands.describe(target="Site to stop monitoring")
+@app_commands.choices(target=MONITOR_CHOICES)
 @app_commands.default_permissions(manage_messages=True)
 @app_commands.checks.has_any_role(*MOD_ROLE_IDS)
-async def ddpause(interaction: discord.Interaction):
+async def ddpause(interaction: discord.Interaction, target: app_commands.Choice[str]):
     if interaction.channel_id != MODCHANNEL_ID:
         await interaction.response.send_message("This command can only be used in [modlogs](https://discord.com/channels/1382432361840509039/1383551896354164800).", ephemeral=True)
         return
     
-    if bot.repo_detector_paused:
-        await interaction.response.send_message(f"{REPO_URL} down detector is already paused.", ephemeral=True)
+    monitor = monitor_targets[target.value]
+    if monitor.paused:
+        await interaction.response.send_message(f"{monitor.url} down detector is already paused.", ephemeral=True)
         return
     
-    bot.repo_detector_paused = True
-    check_repo_status.cancel()
+    monitor.paused = True
+    if monitor.probe_task is not None and not monitor.probe_task.done():
+        monitor.probe_task.cancel()
     
     embed = discord.Embed(
-        title="⏸️ EPGenius Down Detector Paused",
-        description=f"Monitoring for {REPO_URL} has been paused",
+        title=f"⏸️ {monitor.name} Down Detector Paused",
+        description=f"Monitoring for {monitor.url} has been paused",
         color=discord.Color.orange()
     )
     await interaction.response.send_message(embed=embed)
 
 
 # ============================================================================
-# BOT /DDRESUME COMMAND (EPGenius)
+# BOT /DDRESUME COMMAND
 # ============================================================================  
 
-@bot.tree.command(name="ddresume", description="Resume EPGenius.org Down Detector")
+@bot.tree.command(name="ddresume", description="Resume a Down Detector")
+@app_commands.describe(target="Site to resume monitoring")
+@app_commands.choices(target=MONITOR_CHOICES)
 @app_commands.default_permissions(manage_messages=True)
 @app_commands.checks.has_any_role(*MOD_ROLE_IDS)
-async def ddresume(interaction: discord.Interaction):
+async def ddresume(interaction: discord.Interaction, target: app_commands.Choice[str]):
     if interaction.channel_id != MODCHANNEL_ID:
         await interaction.response.send_message("This command can only be used in [modlogs](https://discord.com/channels/1382432361840509039/1383551896354164800).", ephemeral=True)
         return
     
-    if not bot.repo_detector_paused:
-        await interaction.response.send_message(f"{REPO_URL} down detector is already running.", ephemeral=True)
+    monitor = monitor_targets[target.value]
+    if not monitor.paused:
+        await interaction.response.send_message(f"{monitor.url} down detector is already running.", ephemeral=True)
         return
     
-    bot.repo_detector_paused = False
-    if not check_repo_status.is_running():
-        check_repo_status.start()
+    monitor.paused = False
+    monitor.next_check = 0
     
     embed = discord.Embed(
-        title="▶️ EPGenius Down Detector Resumed",
-        description=f"Monitoring for {REPO_URL} has been resumed",
+        title=f"▶️ {monitor.name} Down Detector Resumed",
+        description=f"Monitoring for {monitor.url} has been resumed",
         color=discord.Color.green()
     )
     await interaction.response.send_message(embed=embed)
 
 
 # ============================================================================
-# BOT /DDSTATUS COMMAND (EPGenius)
+# BOT /DDSTATUS COMMAND
 # ============================================================================
 
-@bot.tree.command(name="ddstatus", description="Check EPGenius.org Down Detector Status")
+@bot.tree.command(name="ddstatus", description="Check Down Detector Status")
+@app_commands.describe(target="Site to check (leave empty for all)")
+@app_commands.choices(target=MONITOR_CHOICES)
 @app_commands.default_permissions(manage_messages=True)
 @app_commands.checks.has_any_role(*MOD_ROLE_IDS)
-async def ddstatus(interaction: discord.Interaction):
+async def ddstatus(interaction: discord.Interaction, target: app_commands.Choice[str] = None):
     if interaction.channel_id != MODCHANNEL_ID:
         await interaction.response.send_message("This command can only be used in [modlogs](https://discord.com/channels/1382432361840509039/1383551896354164800).", ephemeral=True)
         return
 
-    status = "Paused ⏸️" if bot.repo_detector_paused else "Running ▶️"
-    color = discord.Color.orange() if bot.repo_detector_paused else discord.Color.green()
+    monitors = [monitor_targets[target.value]] if target else list(monitor_targets.values())
+    any_paused = any(monitor.paused for monitor in monitors)
     
     embed = discord.Embed(
-        title="EPGenius Down Detector Status",
-        description=f"Status: **{status}**\nMonitoring: {REPO_URL}",
-        color=color
+        title=f"{monitors[0].name} Down Detector Status" if target else "Down Detector Status",
+        color=discord.Color.orange() if any_paused else discord.Color.green()
     )
-    await interaction.response.send_message(embed=embed)
-
+    for monitor in monitors:
+        status = "Paused ⏸️" if monitor.paused else "Running ▶️"
+        site_status = monitor.state or "Pending"
+        if monitor.state == "SUSPECT":
+            site_status += f" ({monitor.samples.count(False)}/{monitor.confirm_failures} failures)"
+        elif monitor.state == "RECOVERING":
+            site_status += f" ({monitor.successes}/{monitor.recovery_successes} successes)"
+        lines = [f"Status: **{status}**", f"Monitoring: {monitor.url}", f"Site: **{site_status}**"]
+        if monitor.last_checked:
+            lines.append(f"Last Check: <t:{int(monitor.last_checked.timestamp())}:R>")
+        if monitor.last_error:
+            lines.append(f"Last Error: {monitor.last_error}")
+        embed.add_field(name=monitor.name, value="\n".join(lines), inline=False)
+    
+    await interaction.response.send_message(embed=embed)       
 
 # ============================================================================
-# BOT /DDPAUSESC COMMAND (StreamCheck)
-# ============================================================================  
+# BOT /DDSTATS COMMAND
+# ============================================================================
 
-bot.sc_detector_paused = False
+UPTIME_WINDOWS = (("1h", 3600), ("24h", 86400), ("7d", 7 * 86400))
 
-@bot.tree.command(name="ddpausesc", description="Pause StreamCheck.pro Down Detector")
-@app_commands.default_permissions(manage_messages=True)
-@app_commands.checks.has_any_role(*MOD_ROLE_IDS)
-async def ddpausesc(interaction: discord.Interaction):
-    if interaction.channel_id != MODCHANNEL_ID:
-        await interaction.response.send_message("This command can only be used in [modlogs](https://discord.com/channels/1382432361840509039/1383551896354164800).", ephemeral=True)
-        return
-    
-    if bot.sc_detector_paused:
-        await interaction.response.send_message(f"{SC_URL} down detector is already paused.", ephemeral=True)
-        return
-    
-    bot.sc_detector_paused = True
-    check_sc_status.cancel()
-    
-    embed = discord.Embed(
-        title="⏸️ StreamCheck Down Detector Paused",
-        description=f"Monitoring for {SC_URL} has been paused",
-        color=discord.Color.orange()
-    )
-    await interaction.response.send_message(embed=embed)
+def format_uptime(value):
+    return "N/A" if value is None else f"{value * 100:.2f}%"
 
+def format_ms(value):
+    return "N/A" if value is None else f"{value:.0f} ms"
 
-# ============================================================================
-# BOT /DDRESUMESC COMMAND (StreamCheck)
-# ============================================================================  
+def format_phase(value, skipped="N/A"):
+    """Probe phase time, or `skipped` when the phase didn't happen (NaN)"""
+    return skipped if math.isnan(value) else format_ms(value)
 
-@bot.tree.command(name="ddresumesc", description="Resume StreamCheck.pro Down Detector")
+@bot.tree.command(name="ddstats", description="Show Down Detector latency and uptime statistics")
+@app_commands.describe(target="Site to show statistics for")
+@app_commands.choices(target=MONITOR_CHOICES)
 @app_commands.default_permissions(manage_messages=True)
 @app_commands.checks.has_any_role(*MOD_ROLE_IDS)
-async def ddresumesc(interaction: discord.Interaction):
+async def ddstats(interaction: discord.Interaction, target: app_commands.Choice[str]):
     if interaction.channel_id != MODCHANNEL_ID:
         await interaction.response.send_message("This command can only be used in [modlogs](https://discord.com/channels/1382432361840509039/1383551896354164800).", ephemeral=True)
         return
-    
-    if not bot.sc_detector_paused:
-        await interaction.response.send_message(f"{SC_URL} down detector is already running.", ephemeral=True)
-        return
-    
-    bot.sc_detector_paused = False
-    if not check_sc_status.is_running():
-        check_sc_status.start()
+
+    monitor = monitor_targets[target.value]
+    history = monitor.history
+    now = time.time()
     
     embed = discord.Embed(
-        title="▶️ StreamCheck Down Detector Resumed",
-        description=f"Monitoring for {SC_URL} has been resumed",
-        color=discord.Color.green()
+        title=f"📊 {monitor.name} Down Detector Stats",
+        description=f"{monitor.url}\n{history.count} probes recorded",
+        color=discord.Color.orange() if monitor.latency_degraded or monitor.last_status == "DOWN" else discord.Color.blue()
     )
-    await interaction.response.send_message(embed=embed)
-
-
-# ============================================================================
-# BOT /DDSTATUSSC COMMAND (StreamCheck)
-# ============================================================================
-
-@bot.tree.command(name="ddstatussc", description="Check StreamCheck.pro Down Detector Status")
-@app_commands.default_permissions(manage_messages=True)
-@app_commands.checks.has_any_role(*MOD_ROLE_IDS)
-async def ddstatussc(interaction: discord.Interaction):
-    if interaction.channel_id != MODCHANNEL_ID:
-        await interaction.response.send_message("This command can only be used in [modlogs](https://discord.com/channels/1382432361840509039/1383551896354164800).", ephemeral=True)
-        return
-
-    status = "Paused ⏸️" if bot.sc_detector_paused else "Running ▶️"
-    color = discord.Color.orange() if bot.sc_detector_paused else discord.Color.green()
     
-    embed = discord.Embed(
-        title="StreamCheck Down Detector Status",
-        description=f"Status: **{status}**\nMonitoring: {SC_URL}",
-        color=color
+    latencies = history.latencies(now - 86400)
+    embed.add_field(
+        name="Latency (24h)",
+        value=f"p50: {format_ms(percentile(latencies, 50))}\np95: {format_ms(percentile(latencies, 95))}\np99: {format_ms(percentile(latencies, 99))}",
+        inline=True
     )
-    await interaction.response.send_message(embed=embed)       
+    
+    max_gap = monitor.interval * 2
+    uptime_lines = [f"{label}: {format_uptime(history.uptime(now - seconds, now, max_gap))}" for label, seconds in UPTIME_WINDOWS]
+    embed.add_field(name="Uptime", value="\n".join(uptime_lines), inline=True)
+    
+    last = history.last()
+    if last:
+        dns = format_phase(last['dns'], "cached" if last['ok'] else "N/A")
+        connect = format_phase(last['connect'], "reused" if last['ok'] else "N/A")
+        embed.add_field(
+            name="Last Probe",
+            value=f"DNS: {dns}\nConnect: {connect}\nTTFB: {format_phase(last['ttfb'])}\nTotal: {format_phase(last['total'])}",
+            inline=True
+        )
+    
+    incident_lines = []
+    for incident in list(monitor.incidents)[-5:][::-1]:
+        if incident["end"] is None:
+            incident_lines.append(f"<t:{int(incident['start'])}:R> - ongoing ({incident['error']})")
+        else:
+            minutes = max(1, round((incident["end"] - incident["start"]) / 60))
+            incident_lines.append(f"<t:{int(incident['start'])}:R> - {minutes} min ({incident['error']})")
+    embed.add_field(name="Recent Incidents", value="\n".join(incident_lines) or "None", inline=False)
+    
+    await interaction.response.send_message(embed=embed)
 
 # ============================================================================
 # BOT /KILLEPGBOT COMMAND
@@ -1546,8 +3292,18 @@ async def killepgbot(interaction: discord.Interaction):
 # HANDLE MISSING ROLE AND UNDEFINED ERRORS
 # ============================================================================     
 
+def record_command_duration(interaction, status):
+    command_name = interaction.command.qualified_name if interaction.command else "unknown"
+    elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+    command_duration.observe((command_name, status), elapsed)
+
+@bot.event
+async def on_app_command_completion(interaction, command):
+    record_command_duration(interaction, "ok")
+
 @bot.tree.error
 async def on_app_command_error(interaction, error):
+    record_command_duration(interaction, "error")
     if isinstance(error, MissingAnyRole):
         await interaction.response.send_message(
             "You don't have the required role(s) to run this command.",
@@ -1569,102 +3325,196 @@ async def epglookup(interaction: discord.Interaction, query: str):
     playlists = await get_playlists()
     
     if playlists is None:
-        await interaction.followup.send(
+        await send_followup(
+            interaction,
             "Unable to fetch playlist data. The server is down and no cache is available. Please try again later.",
             ephemeral=True
         )
         return
 
     if query.lower() == "list":
-        embeds = []
-        current_embed = discord.Embed(title="All Playlists (Page 1)", color=discord.Color.blue())
-        field_count = 0
-        page_num = 1
-        
-        for p in playlists:
-            epg_display = p['epg_url'] if p['epg_url'] and p['epg_url'].lower() not in ["n/a", "use provider's epg"] else "No EPG URL"
-            owner_display = p['owner'] or "N/A"
-            
-            if field_count >= 25:
-                embeds.append(current_embed)
-                page_num += 1
-                current_embed = discord.Embed(title=f"All Playlists (Page {page_num})", color=discord.Color.blue())
-                field_count = 0
-            
-            current_embed.add_field(
-                name=f"#{p['number']} - {owner_display}",
-                value=f"Provider: {p['provider']}\nEPG: {epg_display}",
-                inline=False
-            )
-            field_count += 1
-        
-        if field_count > 0:
-            embeds.append(current_embed)
-        
-        if len(embeds) == 1:
-            await interaction.followup.send(embed=embeds[0], ephemeral=True)
-        else:
-            await interaction.followup.send(embed=embeds[0], ephemeral=True)
-            for embed in embeds[1:]:
-                await interaction.followup.send(embed=embed, ephemeral=True)
+        view = PlaylistListView(playlists)
+        view.update_buttons()
+        message = await send_followup(interaction, embed=view.get_embed(), view=view, ephemeral=True)
+        view.message = message
         return
 
     if query.lower() == "owner":
-        owners = sorted({p['owner'] for p in playlists if p.get("owner")})
+        owners = playlists.owners()
         if not owners:
-            await interaction.followup.send("No owners found.", ephemeral=True)
+            await send_followup(interaction, "No owners found.", ephemeral=True)
             return
         view = OwnerSelectView(owners, playlists)
-        await interaction.followup.send("Select an owner:", view=view, ephemeral=True)
+        await send_followup(interaction, "Select an owner:", view=view, ephemeral=True)
         return
 
     try:
         number_query = int(query)
-        playlist = next((p for p in playlists if p["number"] == number_query), None)
+        playlist = playlists.get(number_query)
         if not playlist:
-            await interaction.followup.send(f"No playlist found for #{number_query}.", ephemeral=True)
+            await send_followup(interaction, f"No playlist found for #{number_query}.", ephemeral=True)
             return
 
-        embed = discord.Embed(title=f"Playlist #{playlist['number']} EPG Info", color=discord.Color.blue())
-        embed.add_field(name="Owner", value=playlist['owner'] or "N/A", inline=True)
-        embed.add_field(name="Provider", value=playlist['provider'], inline=True)
-        epg_url = playlist['epg_url'] or "No EPG URL available"
+        embed = discord.Embed(title=f"Playlist #{playlist.number} EPG Info", color=discord.Color.blue())
+        embed.add_field(name="Owner", value=playlist.owner or "N/A", inline=True)
+        embed.add_field(name="Provider", value=playlist.provider, inline=True)
+        epg_url = playlist.epg_url or "No EPG URL available"
         embed.add_field(name="EPG URL", value=epg_url, inline=False)
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await send_followup(interaction, embed=embed, ephemeral=True)
         return
     except ValueError:
-        owners = [p["owner"] for p in playlists if p.get("owner")]
-        matches = process.extract(query, owners, scorer=fuzz.WRatio)
-        filtered_matches = [m for m in matches if m[1] >= 80]
+        filtered_matches = await run_cpu(
+            "epg_search", playlists.search_owners, query,
+            fallback=lambda: playlists.match_owners(query)
+        )
 
         if not filtered_matches:
-            owners = sorted(set(owners))
+            owners = playlists.owners()
             view = OwnerSelectView(owners, playlists)
-            await interaction.followup.send(f"No close matches found for '{query}'. Please select an owner:", view=view, ephemeral=True)
+            await send_followup(interaction, f"No close matches found for '{query}'. Please select an owner:", view=view, ephemeral=True)
             return
 
         embed = discord.Embed(title=f"Playlists matching '{query}'", color=discord.Color.blue())
-        seen_owners = set()
 
         for match_name, score in filtered_matches:
-            if match_name in seen_owners:
-                continue
-            seen_owners.add(match_name)
-
-            matched_playlists = [p for p in playlists if p["owner"] == match_name]
+            matched_playlists = playlists.find_owner(match_name)
             for p in matched_playlists:
-                epg_display = p['epg_url'] if p['epg_url'] and p['epg_url'].lower() not in ["n/a", "use provider’s epg"] else "No EPG URL"
+                epg_display = p.epg_url if p.epg_url and p.epg_url.lower() not in ["n/a", "use provider’s epg"] else "No EPG URL"
+                score_display = f" (score {score})" if score is not None else ""
                 embed.add_field(
-                    name=f"#{p['number']} - {p['owner']} (score {score})",
-                    value=f"Provider: {p['provider']}\nEPG: {epg_display}",
+                    name=f"#{p.number} - {p.owner}{score_display}",
+                    value=f"Provider: {p.provider}\nEPG: {epg_display}",
                     inline=False
                 )
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        await send_followup(interaction, embed=embed, ephemeral=True)
+
+# ============================================================================
+# COMMAND SYNC
+# ============================================================================ 
+
+bot.command_signatures = {}
+
+def save_command_signatures():
+    try:
+        with open(COMMAND_SYNC_FILE, 'w') as f:
+            json.dump(bot.command_signatures, f, indent=2)
+    except Exception as e:
+        print(f"Error saving command sync state: {e}")
+
+def load_command_signatures():
+    try:
+        if not os.path.exists(COMMAND_SYNC_FILE):
+            print("No command sync state found")
+            return
+        
+        with open(COMMAND_SYNC_FILE, 'r') as f:
+            bot.command_signatures = json.load(f)
+        print(f"Loaded command sync state for {len(bot.command_signatures)} scope(s)")
+    except Exception as e:
+        print(f"Error loading command sync state: {e}")
+
+def command_scope(guild=None):
+    """Key and display name for a command sync scope"""
+    if guild is None:
+        return "global", "Global"
+    found = bot.get_guild(guild.id)
+    return str(guild.id), f"{found.name if found else 'Unknown'} ({guild.id})"
+
+def command_payload(command):
+    """Serialize an app command the way it is sent to Discord"""
+    try:
+        return command.to_dict(bot.tree)
+    except TypeError:
+        return command.to_dict()
+
+def command_signature(guild=None):
+    """Stable hash of the app commands registered for a scope"""
+    payload = sorted(
+        (command_payload(cmd) for cmd in bot.tree.get_commands(guild=guild)),
+        key=lambda cmd: (cmd.get("type", 1), cmd["name"])
+    )
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+async def sync_commands(guild=None):
+    """Sync one command scope, skipping it when its signature is unchanged"""
+    scope, scope_name = command_scope(guild)
+    
+    signature = command_signature(guild)
+    last_sync = bot.command_signatures.get(scope)
+    if last_sync and last_sync.get("signature") == signature:
+        print(f"Commands unchanged for {scope_name}, skipping sync")
+        return
+    
+    try:
+        synced = await bot.tree.sync(guild=guild)
+        bot.command_signatures[scope] = {
+            "name": scope_name,
+            "signature": signature,
+            "synced_at": datetime.now(timezone.utc).isoformat(),
+            "count": len(synced)
+        }
+        save_command_signatures()
+        print(f"Synced {len(synced)} commands to {scope_name}: {[cmd.name for cmd in synced]}")
+    except Exception as e:
+        print(f"Failed to sync to {scope_name}: {e}")
+
+async def sync_command_tree():
+    """Sync the global and per-guild command scopes concurrently"""
+    await asyncio.gather(
+        sync_commands(),
+        *(sync_commands(guild_obj) for guild_obj in ALL_GUILDS)
+    )
+
+# ============================================================================
+# BOT /SYNCSTATUS COMMAND
+# ============================================================================
+
+@bot.tree.command(name="syncstatus", description="Show Slash Command Sync Status")
+@app_commands.default_permissions(manage_messages=True)
+@app_commands.checks.has_any_role(*MOD_ROLE_IDS)
+async def syncstatus(interaction: discord.Interaction):
+    if interaction.channel_id != MODCHANNEL_ID:
+        await interaction.response.send_message("This command can only be used in [modlogs](https://discord.com/channels/1382432361840509039/1383551896354164800).", ephemeral=True)
+        return
+
+    embed = discord.Embed(title="Slash Command Sync Status", color=discord.Color.blue())
+
+    for guild_obj in [None, *ALL_GUILDS]:
+        scope, scope_name = command_scope(guild_obj)
+        last_sync = bot.command_signatures.get(scope)
+        
+        if not last_sync:
+            embed.add_field(name=scope_name, value="Never synced", inline=False)
+            continue
+        
+        synced_at = datetime.fromisoformat(last_sync["synced_at"])
+        current = "✅ Up to date" if last_sync["signature"] == command_signature(guild_obj) else "⚠️ Changed since last sync"
+        embed.add_field(
+            name=scope_name,
+            value=f"**Last Sync:** {format_datetime(synced_at)}\n**Commands:** {last_sync.get('count', 'N/A')}\n**Hash:** `{last_sync['signature'][:16]}`\n**Status:** {current}",
+            inline=False
+        )
+
+    await interaction.response.send_message(embed=embed)
 
 # ============================================================================
 # ONREADY
 # ============================================================================ 
 
+bot.startup_complete = False
+
+def signal_supervisor_ready():
+    """Tell the supervisor, when running under one, that startup finished"""
+    ready_fd = os.getenv("EPGENIUSBOT_READY_FD")
+    if not ready_fd:
+        return
+    try:
+        os.write(int(ready_fd), b"ready\n")
+        os.close(int(ready_fd))
+    except (OSError, ValueError) as e:
+        print(f"Could not signal supervisor: {e}")
+
 @bot.event
 async def on_ready():
     print(f"{bot.user} is online!")
@@ -1678,12 +3528,7 @@ async def on_ready():
         print(f"Bot log channel found: {BOTLOGCHANNEL.name}")
     else:
         print(f"Warning: Could not find bot log channel with ID {BOTLOGCHANNEL_ID}")
-    
-    if not check_repo_status.is_running():
-        check_repo_status.start()
-        print(f"EPGenius server status monitoring started for {REPO_URL}")
 
-    
     global MODCHANNEL
     MODCHANNEL = bot.get_channel(MODCHANNEL_ID)
     if MODCHANNEL:
@@ -1698,28 +3543,21 @@ async def on_ready():
     else:
         print(f"Warning: Could not find StreamCheck Updates channel with ID {SC_UPDATES_CHANNEL_ID}")
     
-    if not check_sc_status.is_running():
-        check_sc_status.start()
-        print(f"StreamCheck server status monitoring started for {SC_URL}")
+    if not monitor_scheduler.is_running():
+        monitor_scheduler.start()
+        for target in monitor_targets.values():
+            print(f"{target.name} server status monitoring started for {target.url}")
 
-    logos = await get_logo_list()
-    if logos:
-        print(f"Pre-cached {len(logos)} logos")
-    else:
-        print("Failed to pre-cache logos")    
-
-    synced_global = await bot.tree.sync()
-    print(f"Synced {len(synced_global)} global commands: {[cmd.name for cmd in synced_global]}")
+    if bot.startup_complete:
+        print(f"{bot.user} reconnected")
+        return
+    bot.startup_complete = True
 
-    for guild_obj in ALL_GUILDS:
-        guild = bot.get_guild(guild_obj.id)
-        guild_name = guild.name if guild else "Unknown"
-        try:
-            synced = await bot.tree.sync(guild=guild_obj)
-            print(f"Synced {len(synced)} commands to guild {guild_name} ({guild_obj.id})")
-        except Exception as e:
-            print(f"Failed to sync to guild {guild_name} ({guild_obj.id}): {e}")
+    # Command sync runs in the background; existing commands keep working meanwhile
+    bot.command_sync_task = asyncio.create_task(sync_command_tree())
 
     print(f"{bot.user} is fully ready!")
+    signal_supervisor_ready()
 
-bot.run(TOKEN)
\ No newline at end of file
+if __name__ == "__main__":
+    bot.run(TOKEN)
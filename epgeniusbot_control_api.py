@@ -1,77 +1,88 @@
-from flask import Flask, jsonify, request
-import subprocess
+from aiohttp import web
+import aiohttp
+import asyncio
 import os
 from dotenv import load_dotenv
+from epgeniusbot_supervisor import BOT_DIR, send_command
 
 load_dotenv()
 
-app = Flask(__name__)
-
 BOT_CONTROL_API_TOKEN = os.getenv("BOT_CONTROL_API_TOKEN")
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+HEALTH_TIMEOUT = aiohttp.ClientTimeout(total=2)
+START_SCRIPT = os.path.join(BOT_DIR, "epgeniusbot_start.sh")
+SUPERVISOR_CONNECT_TIMEOUT = 5
 
 if not BOT_CONTROL_API_TOKEN:
     raise ValueError("BOT_CONTROL_API_TOKEN not set in .env file")
 
-def check_auth():
+def check_auth(request):
     token = request.headers.get('Authorization')
     if not token or token != f'Bearer {BOT_CONTROL_API_TOKEN}':
         return False
     return True
 
-def run_script(script_name):
+async def launch_supervisor():
+    """Bring the supervisor up the same way epgeniusbot_start.sh does, without waiting on it"""
+    process = await asyncio.create_subprocess_exec(
+        START_SCRIPT,
+        cwd=BOT_DIR,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+        start_new_session=True
+    )
+    # Reap the script in the background once its own start request returns
+    asyncio.create_task(process.wait())
+
+async def call_supervisor(command):
     try:
-        result = subprocess.run(
-            [f'/home/ubuntu/epgeniusbot/{script_name}'],
-            capture_output=True,
-            text=True,
-            timeout=60
-        )
-        
-        output = result.stdout.strip() 
-        success = result.returncode == 0
-        
-        response = {
-            'success': success,
-            'message': output if output else None
-        }
-        
-        if result.stderr and result.stderr.strip():
-            response['error'] = result.stderr.strip()
-            
-        return response
-        
-    except subprocess.TimeoutExpired:
-        return {'success': False, 'error': 'Script timeout'}
+        try:
+            return await send_command(command)
+        except (FileNotFoundError, ConnectionRefusedError):
+            if command not in ('start', 'restart'):
+                raise
+        # No supervisor means no bot either, so a restart is just a start
+        await launch_supervisor()
+        return await send_command('start', connect_timeout=SUPERVISOR_CONNECT_TIMEOUT)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return {'success': False, 'error': 'Supervisor is not running'}
+    except asyncio.TimeoutError:
+        return {'success': False, 'error': 'Supervisor timeout'}
     except Exception as e:
         return {'success': False, 'error': str(e)}
 
-@app.route('/status', methods=['GET'])
-def status():
-    if not check_auth():
-        return jsonify({'error': 'Unauthorized'}), 401
-    result = run_script('epgeniusbot_status.sh')
-    return jsonify(result)
+async def fetch_bot_health():
+    """Read the bot's own health endpoint, or None if it isn't answering"""
+    try:
+        async with aiohttp.ClientSession(timeout=HEALTH_TIMEOUT) as session:
+            async with session.get(f"http://{METRICS_HOST}:{METRICS_PORT}/health") as response:
+                if response.status != 200:
+                    return None
+                return await response.json()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
 
-@app.route('/start', methods=['POST'])
-def start():
-    if not check_auth():
-        return jsonify({'error': 'Unauthorized'}), 401
-    result = run_script('epgeniusbot_start.sh')
-    return jsonify(result)
+async def status(request):
+    if not check_auth(request):
+        return web.json_response({'error': 'Unauthorized'}, status=401)
+    result, health = await asyncio.gather(call_supervisor('status'), fetch_bot_health())
+    result['health'] = health
+    return web.json_response(result)
 
-@app.route('/stop', methods=['POST'])
-def stop():
-    if not check_auth():
-        return jsonify({'error': 'Unauthorized'}), 401
-    result = run_script('epgeniusbot_stop.sh')
-    return jsonify(result)
+def control_route(command):
+    async def handler(request):
+        if not check_auth(request):
+            return web.json_response({'error': 'Unauthorized'}, status=401)
+        result = await call_supervisor(command)
+        return web.json_response(result)
+    return handler
 
-@app.route('/restart', methods=['POST'])
-def restart():
-    if not check_auth():
-        return jsonify({'error': 'Unauthorized'}), 401
-    result = run_script('epgeniusbot_restart.sh')
-    return jsonify(result)
+app = web.Application()
+app.router.add_get('/status', status)
+app.router.add_post('/start', control_route('start'))
+app.router.add_post('/stop', control_route('stop'))
+app.router.add_post('/restart', control_route('restart'))
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000)
+    web.run_app(app, host='0.0.0.0', port=5000)
@@ -2,41 +2,17 @@
 
 exec 1> >(stdbuf -o0 cat)
 
-if pgrep -f "epgeniusbot.py" > /dev/null; then
-    echo "epgeniusbot is already running"
-    exit 0
-fi
-
-if ! tmux has-session -t epgeniusbot 2>/dev/null; then
-    tmux new-session -d -s epgeniusbot
-fi
-
-tmux send-keys -t epgeniusbot C-l
-tmux clear-history -t epgeniusbot
-
-tmux send-keys -t epgeniusbot "cd /home/ubuntu/epgeniusbot && python3 /home/ubuntu/epgeniusbot/epgeniusbot.py" Enter
+cd /home/ubuntu/epgeniusbot
 
-sleep 2
+if ! python3 epgeniusbot_supervisor.py status > /dev/null 2>&1; then
+    if ! tmux has-session -t epgeniusbot 2>/dev/null; then
+        tmux new-session -d -s epgeniusbot
+    fi
 
-TIMEOUT=60
-ELAPSED=0
+    tmux send-keys -t epgeniusbot C-l
+    tmux clear-history -t epgeniusbot
 
-while [ $ELAPSED -lt $TIMEOUT ]; do
-    RECENT_OUTPUT=$(tmux capture-pane -t epgeniusbot -p -S -50)
-    
-    if echo "$RECENT_OUTPUT" | grep -q "epgeniusbot#3611 is fully ready"; then
-        echo "epgeniusbot has started"
-        exit 0
-    fi
-    
-    if ! pgrep -f "epgeniusbot.py" > /dev/null; then
-        echo "epgeniusbot failed to start (process died)"
-        exit 1
-    fi
-    
-    sleep 1
-    ELAPSED=$((ELAPSED + 1))
-done
+    tmux send-keys -t epgeniusbot "cd /home/ubuntu/epgeniusbot && python3 /home/ubuntu/epgeniusbot/epgeniusbot_supervisor.py --no-autostart" Enter
+fi
 
-echo "epgeniusbot started but ready message not detected within ${TIMEOUT}s"
-exit 1
+exec python3 epgeniusbot_supervisor.py start
@@ -1,9 +1,8 @@
 #!/bin/bash
 
-if pgrep -f "epgeniusbot.py" > /dev/null; then
-    echo "epgeniusbot is alive"
-    exit 0
-else
+cd /home/ubuntu/epgeniusbot
+
+if ! python3 epgeniusbot_supervisor.py status 2>/dev/null; then
     echo "He's dead, Jim!"
-    exit 0
-fi
\ No newline at end of file
+fi
+exit 0
\ No newline at end of file
@@ -1,29 +1,10 @@
 #!/bin/bash
 
-if ! pgrep -f "epgeniusbot.py" > /dev/null; then
+cd /home/ubuntu/epgeniusbot
+
+if ! python3 epgeniusbot_supervisor.py status > /dev/null 2>&1; then
     echo "He's (already) dead, Jim!"
     exit 0
 fi
 
-tmux send-keys -t epgeniusbot C-c
-
-TIMEOUT=10
-ELAPSED=0
-
-while [ $ELAPSED -lt $TIMEOUT ]; do
-    if ! pgrep -f "epgeniusbot.py" > /dev/null; then
-        echo "He's dead, Jim!"
-        exit 0
-    fi
-    
-    sleep 1
-    ELAPSED=$((ELAPSED + 1))
-done
-
-if pgrep -f "epgeniusbot.py" > /dev/null; then
-    echo "failed to kill epgeniusbot"
-    exit 1
-fi
-
-echo "He's dead, Jim!"
-exit 0
+exec python3 epgeniusbot_supervisor.py stop
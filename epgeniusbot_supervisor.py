@@ -0,0 +1,243 @@
+import asyncio
+import json
+import os
+import signal
+import sys
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ============================================================================
+# VARIABLES
+# ============================================================================
+
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+BOT_SCRIPT = os.path.join(BOT_DIR, "epgeniusbot.py")
+SUPERVISOR_SOCKET = os.getenv("SUPERVISOR_SOCKET", os.path.join(BOT_DIR, "epgeniusbot_supervisor.sock"))
+READY_FD_ENV = "EPGENIUSBOT_READY_FD"
+READY_TIMEOUT = 60
+STOP_TIMEOUT = 10
+KILL_TIMEOUT = 5
+CONNECT_RETRY_INTERVAL = 0.1
+
+# ============================================================================
+# BOT PROCESS SUPERVISOR
+# ============================================================================
+
+class BotSupervisor:
+    """Owns the bot process and learns readiness from a pipe the bot writes to"""
+    def __init__(self):
+        self.process = None
+        self.state = "stopped"
+        self.started_at = None
+        self.ready_at = None
+        self.last_exit_code = None
+        self.ready = asyncio.Event()
+        self.exited = asyncio.Event()
+        self.exited.set()
+        self.lock = asyncio.Lock()
+
+    def is_running(self):
+        return self.process is not None and self.process.returncode is None
+
+    async def spawn(self):
+        read_fd, write_fd = os.pipe()
+        env = dict(os.environ, **{READY_FD_ENV: str(write_fd)})
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, BOT_SCRIPT,
+                cwd=BOT_DIR,
+                env=env,
+                pass_fds=(write_fd,)
+            )
+        except Exception:
+            os.close(read_fd)
+            raise
+        finally:
+            os.close(write_fd)
+
+        self.process = process
+        self.state = "starting"
+        self.started_at = time.time()
+        self.ready_at = None
+        self.ready = asyncio.Event()
+        self.exited = asyncio.Event()
+        asyncio.create_task(self.watch(process, read_fd, self.ready, self.exited))
+        print(f"epgeniusbot started (pid {process.pid})")
+
+    async def watch(self, process, read_fd, ready, exited):
+        """Follow one bot process until it exits"""
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        transport, _ = await loop.connect_read_pipe(
+            lambda: asyncio.StreamReaderProtocol(reader),
+            os.fdopen(read_fd, "rb", 0)
+        )
+        try:
+            async for line in reader:
+                if line.strip() == b"ready" and process is self.process:
+                    self.state = "ready"
+                    self.ready_at = time.time()
+                    ready.set()
+                    print(f"epgeniusbot is ready (pid {process.pid})")
+        finally:
+            transport.close()
+
+        returncode = await process.wait()
+        if process is self.process:
+            self.state = "stopped"
+            self.last_exit_code = returncode
+        exited.set()
+        print(f"epgeniusbot exited with code {returncode} (pid {process.pid})")
+
+    async def wait_until_ready(self):
+        """Return True once ready, False if the process died or the timeout passed"""
+        waiters = [asyncio.create_task(self.ready.wait()), asyncio.create_task(self.exited.wait())]
+        try:
+            await asyncio.wait(waiters, timeout=READY_TIMEOUT, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        return self.ready.is_set()
+
+    async def start(self, action="start"):
+        if not self.is_running():
+            await self.spawn()
+        elif self.state == "ready":
+            return {"success": True, "message": "epgeniusbot is already running"}
+
+        if await self.wait_until_ready():
+            return {"success": True, "message": f"epgeniusbot has {action}ed"}
+        if self.exited.is_set():
+            return {"success": False, "message": f"epgeniusbot failed to {action} (process died)"}
+        return {"success": False, "message": f"epgeniusbot started but ready message not detected within {READY_TIMEOUT}s"}
+
+    async def stop(self):
+        if not self.is_running():
+            return {"success": True, "message": "He's (already) dead, Jim!"}
+
+        self.state = "stopping"
+        self.process.send_signal(signal.SIGINT)
+        try:
+            await asyncio.wait_for(self.exited.wait(), timeout=STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"epgeniusbot did not exit within {STOP_TIMEOUT}s, killing it")
+            self.process.kill()
+            try:
+                await asyncio.wait_for(self.exited.wait(), timeout=KILL_TIMEOUT)
+            except asyncio.TimeoutError:
+                return {"success": False, "message": "failed to kill epgeniusbot"}
+        return {"success": True, "message": "He's dead, Jim!"}
+
+    def status(self):
+        running = self.is_running()
+        now = time.time()
+        return {
+            "success": True,
+            "message": "epgeniusbot is alive" if running else "He's dead, Jim!",
+            "state": self.state,
+            "pid": self.process.pid if running else None,
+            "uptime": round(now - self.started_at, 1) if running else None,
+            "ready_after": round(self.ready_at - self.started_at, 1) if self.ready_at and running else None,
+            "last_exit_code": self.last_exit_code
+        }
+
+    async def handle_command(self, command):
+        if command == "status":
+            return self.status()
+        if command not in ("start", "stop", "restart"):
+            return {"success": False, "error": f"Unknown command: {command}"}
+
+        async with self.lock:
+            if command == "start":
+                return await self.start()
+            if command == "stop":
+                return await self.stop()
+            stopped = await self.stop()
+            if not stopped["success"]:
+                return stopped
+            return await self.start(action="restart")
+
+    async def handle_client(self, reader, writer):
+        try:
+            request = json.loads(await reader.readline())
+            response = await self.handle_command(request.get("command"))
+        except Exception as e:
+            response = {"success": False, "error": f"{type(e).__name__}: {e}"}
+
+        try:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+# ============================================================================
+# CONTROL SOCKET CLIENT
+# ============================================================================
+
+async def send_command(command, timeout=READY_TIMEOUT + STOP_TIMEOUT + KILL_TIMEOUT + 5, connect_timeout=0):
+    """Send a command to the supervisor socket and return its JSON response"""
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        try:
+            reader, writer = await asyncio.open_unix_connection(SUPERVISOR_SOCKET)
+            break
+        except (FileNotFoundError, ConnectionRefusedError):
+            if time.monotonic() >= deadline:
+                raise
+            await asyncio.sleep(CONNECT_RETRY_INTERVAL)
+
+    try:
+        writer.write(json.dumps({"command": command}).encode() + b"\n")
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), timeout=timeout)
+        return json.loads(line)
+    finally:
+        writer.close()
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+async def run_supervisor(autostart=True):
+    supervisor = BotSupervisor()
+    if os.path.exists(SUPERVISOR_SOCKET):
+        os.unlink(SUPERVISOR_SOCKET)
+    server = await asyncio.start_unix_server(supervisor.handle_client, SUPERVISOR_SOCKET)
+    os.chmod(SUPERVISOR_SOCKET, 0o600)
+    print(f"epgeniusbot supervisor listening on {SUPERVISOR_SOCKET}")
+
+    shutdown = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, shutdown.set)
+
+    if autostart:
+        asyncio.create_task(supervisor.handle_command("start"))
+
+    try:
+        await shutdown.wait()
+    finally:
+        server.close()
+        await server.wait_closed()
+        async with supervisor.lock:
+            await supervisor.stop()
+        if os.path.exists(SUPERVISOR_SOCKET):
+            os.unlink(SUPERVISOR_SOCKET)
+        print("epgeniusbot supervisor stopped")
+
+async def run_client(command):
+    try:
+        result = await send_command(command, connect_timeout=5 if command in ("start", "restart") else 0)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("epgeniusbot supervisor is not running", file=sys.stderr)
+        return 1
+
+    print(result.get("message") or result.get("error"))
+    return 0 if result.get("success") else 1
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] != "--no-autostart":
+        sys.exit(asyncio.run(run_client(sys.argv[1])))
+    asyncio.run(run_supervisor(autostart="--no-autostart" not in sys.argv))
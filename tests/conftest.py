@@ -0,0 +1,16 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# epgeniusbot reads its Discord IDs at import time
+for name, value in {
+    "MOD_ROLE_IDS": "1",
+    "GSR_GUILD_ID": "2",
+    "EPGENIUS_GUILD_ID": "3",
+    "BOTLOGCHANNEL_ID": "4",
+    "MODCHANNEL_ID": "5",
+    "SC_UPDATES_CHANNEL_ID": "6",
+    "GSR_ID": "7",
+}.items():
+    os.environ.setdefault(name, value)
@@ -0,0 +1,25 @@
+import asyncio
+import json
+
+import epgeniusbot
+
+
+def test_legacy_playlist_cache_loads(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    baseline = {
+        "timestamp": "2026-01-01T00:00:00",
+        "playlists": [
+            {"number": 7, "owner": "Someone", "provider": "Provider A", "epg_url": "https://example.com/7.xml"},
+            {"number": 8, "owner": None, "provider": "Provider B", "epg_url": None}
+        ]
+    }
+    (tmp_path / epgeniusbot.LEGACY_PLAYLIST_CACHE_FILE).write_text(json.dumps(baseline))
+
+    catalog = asyncio.run(epgeniusbot.load_playlist_cache())
+
+    assert catalog is not None
+    assert len(catalog) == 2
+    entry = catalog.get(7)
+    assert (entry.owner, entry.provider, entry.epg_url) == ("Someone", "Provider A", "https://example.com/7.xml")
+    assert [playlist.number for playlist in catalog.find_owner("someone")] == [7]
+    assert catalog.get(8).owner is None
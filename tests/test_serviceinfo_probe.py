@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+import epgeniusbot
+
+PROBE_DEADLINE = 0.5
+TICK = 0.02
+
+
+async def start_fake_panel(delay):
+    """Local provider panel whose player_api.php hangs for `delay` seconds"""
+    async def player_api(request):
+        await asyncio.sleep(delay)
+        return web.json_response({"user_info": {"status": "Active"}})
+
+    app = web.Application()
+    app.router.add_get("/player_api.php", player_api)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}"
+
+
+async def probe_while_ticking():
+    """Run a hanging probe next to a ticker and report what each observed"""
+    runner, dns = await start_fake_panel(PROBE_DEADLINE * 4)
+    ticks = 0
+    stop = asyncio.Event()
+
+    async def ticker():
+        nonlocal ticks
+        while not stop.is_set():
+            await asyncio.sleep(TICK)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.monotonic()
+    try:
+        result = await epgeniusbot.probe_player_api(dns, "user", "pass")
+        elapsed = time.monotonic() - start
+    finally:
+        stop.set()
+        await ticker_task
+        await epgeniusbot.close_http_client()
+        await runner.cleanup()
+    return result, elapsed, ticks
+
+
+def test_hanging_probe_times_out_without_blocking_loop(monkeypatch):
+    monkeypatch.setattr(epgeniusbot, "SERVICEINFO_PROBE_DEADLINE", PROBE_DEADLINE)
+
+    result, elapsed, ticks = asyncio.run(probe_while_ticking())
+
+    assert result is None
+    assert PROBE_DEADLINE <= elapsed < PROBE_DEADLINE + 0.5
+    # Other coroutines kept being scheduled for most of the probe
+    assert ticks >= (PROBE_DEADLINE / TICK) * 0.5
+
+
+def test_waiting_for_probe_slot_counts_against_deadline(monkeypatch):
+    monkeypatch.setattr(epgeniusbot, "SERVICEINFO_PROBE_DEADLINE", PROBE_DEADLINE)
+    monkeypatch.setattr(epgeniusbot, "serviceinfo_probe_slots", asyncio.Semaphore(0))
+
+    result, elapsed, ticks = asyncio.run(probe_while_ticking())
+
+    assert result is None
+    assert PROBE_DEADLINE <= elapsed < PROBE_DEADLINE + 0.5
@@ -0,0 +1,31 @@
+import asyncio
+
+import epgeniusbot
+
+
+def test_invalidate_discards_lookup_in_flight(monkeypatch):
+    """A lookup started before a registration must not cache the pre-registration list"""
+    registered = []
+    fetches = 0
+
+    async def fetch_all_user_playlists(duid):
+        nonlocal fetches
+        fetches += 1
+        snapshot = list(registered)
+        await asyncio.sleep(0.05)
+        return snapshot
+
+    monkeypatch.setattr(epgeniusbot, "fetch_all_user_playlists", fetch_all_user_playlists)
+    monkeypatch.setattr(epgeniusbot, "user_lookup_cache", epgeniusbot.OrderedDict())
+
+    async def scenario():
+        in_flight = asyncio.create_task(epgeniusbot.get_all_user_playlists("42"))
+        await asyncio.sleep(0.01)
+        registered.append("new playlist")
+        epgeniusbot.invalidate_user_lookup("42")
+
+        assert await in_flight == []
+        return await epgeniusbot.get_all_user_playlists("42")
+
+    assert asyncio.run(scenario()) == ["new playlist"]
+    assert fetches == 2